@@ -109,6 +109,7 @@ a = Analysis(
     hiddenimports=[
         'pdfplumber',
         'openpyxl', 
+        'xlsxwriter',
         'pandas',
         'pytesseract',
         'PIL',
@@ -8,7 +8,6 @@ import re
 import logging
 from typing import Dict, List, Optional, Tuple, Set, Any
 from datetime import datetime
-import pandas as pd
 import difflib
 from dataclasses import dataclass
 import json
@@ -139,6 +138,38 @@ class IDPInsuranceExtractor:
             }
         }
         
+        # Compile every pattern once; extraction runs per file over all fields
+        self.field_patterns = {
+            field_key: [re.compile(pattern, re.IGNORECASE | re.MULTILINE | re.DOTALL)
+                        for pattern in self.get_enhanced_patterns_for_field(field_key, field_info['type'])]
+            for field_key, field_info in self.required_fields.items()
+        }
+        self.value_patterns = {
+            'monetary': re.compile(r'(?:rs\.?|₹|inr)?\s*([0-9,]+(?:\.[0-9]{2})?)', re.IGNORECASE),
+            'code': re.compile(r'\b([A-Z0-9\-/]{4,})\b'),
+            'numeric': re.compile(r'\b([0-9]{4,})\b'),
+            'date': re.compile(r'\b([0-9]{1,2}[\/\-\.][0-9]{1,2}[\/\-\.][0-9]{2,4})\b'),
+            'text': re.compile(r'\b([A-Za-z\s&\.\-]{3,50})\b'),
+        }
+        self.monetary_amount_patterns = [
+            re.compile(r'(?:rs\.?|₹|inr)\s*([0-9,]+(?:\.[0-9]{2})?)', re.IGNORECASE),
+            re.compile(r'([0-9,]+(?:\.[0-9]{2})?)\s*(?:rs\.?|₹|inr)', re.IGNORECASE),
+            re.compile(r'\b([0-9]{1,3}(?:,[0-9]{3})*(?:\.[0-9]{2})?)\b', re.IGNORECASE),
+        ]
+        self.code_patterns = [
+            re.compile(r'\b([A-Z0-9\-/]{4,})\b'),
+            re.compile(r'\b([0-9]{4,})\b'),
+            re.compile(r'\b([A-Z]{2,}[0-9]{2,})\b'),
+        ]
+        self.date_patterns = [
+            re.compile(r'\b([0-9]{1,2}[\/\-\.][0-9]{1,2}[\/\-\.][0-9]{2,4})\b', re.IGNORECASE),
+            re.compile(r'\b([0-9]{1,2}\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+[0-9]{4})\b', re.IGNORECASE),
+        ]
+        self.name_patterns = [
+            re.compile(r'\b(?:Mr|Mrs|Ms|Dr|M/s)\.?\s+([A-Za-z\s\.]+)\b'),
+            re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)\b'),
+        ]
+        
         # Initialize IDP components
         # self.comprehensive_extractor = ComprehensiveDataExtractor()
         # self.validation_engine = ValidationEngine()
@@ -251,14 +282,9 @@ class IDPInsuranceExtractor:
     def extract_all_monetary_amounts(self, text: str) -> List[Dict]:
         """Extract all possible monetary amounts"""
         amounts = []
-        patterns = [
-            r'(?:rs\.?|₹|inr)\s*([0-9,]+(?:\.[0-9]{2})?)',
-            r'([0-9,]+(?:\.[0-9]{2})?)\s*(?:rs\.?|₹|inr)',
-            r'\b([0-9]{1,3}(?:,[0-9]{3})*(?:\.[0-9]{2})?)\b',
-        ]
         
-        for pattern in patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
+        for pattern in self.monetary_amount_patterns:
+            for match in pattern.finditer(text):
                 value = match.group(1)
                 amounts.append({
                     'value': value,
@@ -271,14 +297,9 @@ class IDPInsuranceExtractor:
     def extract_all_codes(self, text: str) -> List[Dict]:
         """Extract all possible alphanumeric codes"""
         codes = []
-        patterns = [
-            r'\b([A-Z0-9\-/]{4,})\b',
-            r'\b([0-9]{4,})\b',
-            r'\b([A-Z]{2,}[0-9]{2,})\b'
-        ]
         
-        for pattern in patterns:
-            for match in re.finditer(pattern, text):
+        for pattern in self.code_patterns:
+            for match in pattern.finditer(text):
                 value = match.group(1)
                 codes.append({
                     'value': value,
@@ -291,13 +312,9 @@ class IDPInsuranceExtractor:
     def extract_all_dates(self, text: str) -> List[Dict]:
         """Extract all possible dates"""
         dates = []
-        patterns = [
-            r'\b([0-9]{1,2}[\/\-\.][0-9]{1,2}[\/\-\.][0-9]{2,4})\b',
-            r'\b([0-9]{1,2}\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+[0-9]{4})\b'
-        ]
         
-        for pattern in patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
+        for pattern in self.date_patterns:
+            for match in pattern.finditer(text):
                 value = match.group(1)
                 dates.append({
                     'value': value,
@@ -326,13 +343,9 @@ class IDPInsuranceExtractor:
     def extract_potential_names(self, text: str) -> List[Dict]:
         """Extract potential names"""
         names = []
-        patterns = [
-            r'\b(?:Mr|Mrs|Ms|Dr|M/s)\.?\s+([A-Za-z\s\.]+)\b',
-            r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)\b'
-        ]
         
-        for pattern in patterns:
-            for match in re.finditer(pattern, text):
+        for pattern in self.name_patterns:
+            for match in pattern.finditer(text):
                 value = match.group(1) if match.groups() else match.group()
                 names.append({
                     'value': value.strip(),
@@ -382,26 +395,28 @@ class IDPInsuranceExtractor:
     def extract_values_by_type(self, text: str, field_type: str) -> List[str]:
         """Extract values based on field type"""
         if field_type == 'monetary':
-            return re.findall(r'(?:rs\.?|₹|inr)?\s*([0-9,]+(?:\.[0-9]{2})?)', text, re.IGNORECASE)
+            return self.value_patterns['monetary'].findall(text)
         elif field_type in ['alphanumeric_code', 'vehicle_code']:
-            return re.findall(r'\b([A-Z0-9\-/]{4,})\b', text)
+            return self.value_patterns['code'].findall(text)
         elif field_type == 'numeric_code':
-            return re.findall(r'\b([0-9]{4,})\b', text)
+            return self.value_patterns['numeric'].findall(text)
         elif field_type == 'date':
-            return re.findall(r'\b([0-9]{1,2}[\/\-\.][0-9]{1,2}[\/\-\.][0-9]{2,4})\b', text)
+            return self.value_patterns['date'].findall(text)
         else:
-            return re.findall(r'\b([A-Za-z\s&\.\-]{3,50})\b', text)
+            return self.value_patterns['text'].findall(text)
     
     def extract_with_direct_patterns(self, text: str, field_key: str, field_info: Dict) -> List[ExtractionCandidate]:
         """Enhanced direct pattern matching with comprehensive coverage"""
         candidates = []
         
         # Get patterns based on field type
-        patterns = self.get_enhanced_patterns_for_field(field_key, field_info['type'])
+        patterns = self.field_patterns.get(field_key)
+        if patterns is None:
+            patterns = [re.compile(pattern, re.IGNORECASE | re.MULTILINE | re.DOTALL)
+                        for pattern in self.get_enhanced_patterns_for_field(field_key, field_info['type'])]
         
         for i, pattern in enumerate(patterns):
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE | re.DOTALL)
-            for match in matches:
+            for match in pattern.finditer(text):
                 value = match.group(1).strip() if match.groups() else match.group().strip()
                 if value and len(value) > 0:
                     # Validate the candidate
@@ -634,16 +649,16 @@ class IDPInsuranceExtractor:
                     
                     # Extract values based on field type
                     if field_info['type'] == 'monetary':
-                        values = re.findall(r'(?:rs\.?|₹|inr)?\s*([0-9,]+(?:\.[0-9]{2})?)', context, re.IGNORECASE)
+                        values = self.value_patterns['monetary'].findall(context)
                     elif field_info['type'] == 'alphanumeric_code':
-                        values = re.findall(r'\b([A-Z0-9\-/]{4,})\b', context)
+                        values = self.value_patterns['code'].findall(context)
                     elif field_info['type'] == 'numeric_code':
-                        values = re.findall(r'\b([0-9]{4,})\b', context)
+                        values = self.value_patterns['numeric'].findall(context)
                     elif field_info['type'] == 'date':
-                        values = re.findall(r'\b([0-9]{1,2}[\/\-\.][0-9]{1,2}[\/\-\.][0-9]{2,4})\b', context)
+                        values = self.value_patterns['date'].findall(context)
                     else:
                         # For names and text fields
-                        values = re.findall(r'\b([A-Za-z\s&\.\-]{3,50})\b', context)
+                        values = self.value_patterns['text'].findall(context)
                     
                     for value in values:
                         validation_score = field_info['validation'](value)
@@ -782,8 +797,13 @@ class IDPInsuranceExtractor:
     
     def create_comprehensive_excel(self, extraction_results: Dict, output_path: str) -> bool:
         """Create comprehensive Excel with all data including unmatched"""
+        import pandas as pd  # Only exports need pandas; deferred so importing this module stays cheap
+        
         try:
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+            # Extracted PDF text is written as plain strings, never as formulas, links or numbers
+            with pd.ExcelWriter(output_path, engine='xlsxwriter', engine_kwargs={'options': {
+                    'strings_to_urls': False, 'strings_to_formulas': False, 'strings_to_numbers': False
+            }}) as writer:
                 
                 # Sheet 1: Required Fields Results
                 required_data = []
@@ -8,7 +8,6 @@ import re
 import logging
 from typing import Dict, List, Optional, Tuple, Set
 from datetime import datetime
-import pandas as pd
 import difflib
 from dataclasses import dataclass
 
@@ -110,6 +109,34 @@ class EnhancedInsuranceExtractor:
         self.search_patterns = self.create_enhanced_patterns()
         self.contextual_patterns = self.create_contextual_patterns()
         self.table_patterns = self.create_table_patterns()
+        
+        # Compile every pattern once; extraction runs per file over all fields
+        self.compiled_patterns = {
+            field_key: [re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in patterns]
+            for field_key, patterns in self.search_patterns.items()
+        }
+        self.compiled_alias_patterns = {
+            field_key: [(alias, self.create_alias_patterns(alias)) for alias in field_info['aliases']]
+            for field_key, field_info in self.insurance_fields.items()
+        }
+        self.table_line_patterns = [
+            re.compile(r'([^|\t]+)[\|\t]+([^|\t]+)'), # Pipe or tab separated
+            re.compile(r'([^:]+):\s*([^:]+)'), # Colon separated
+            re.compile(r'(.+?)\s{3,}(.+)'), # Multiple spaces
+        ]
+        self.word_pattern = re.compile(r'\b\w+\b')
+        self.money_pattern = re.compile(r'(?:rs\.?|₹|inr)?\s*([0-9,]+(?:\.[0-9]{2})?)', re.IGNORECASE)
+        self.code_pattern = re.compile(r'\b([A-Z0-9\-/]{4,})\b')
+    
+    def create_alias_patterns(self, alias: str) -> List[re.Pattern]:
+        """Compile the label-followed-by-value patterns for one field alias"""
+        escaped = re.escape(alias.lower())
+        patterns = [
+            rf'{escaped}\s*:?\s*([A-Za-z0-9\s\.\-\/,]+?)(?:\n|$|[|])',
+            rf'{escaped}\s*[:\-]\s*([A-Za-z0-9\s\.\-\/,]+?)(?:\n|$|[|])',
+            rf'{escaped}\s+([A-Za-z0-9\s\.\-\/,]+?)(?:\n|$|[|])',
+        ]
+        return [re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in patterns]
     
     def create_enhanced_patterns(self) -> Dict[str, List[str]]:
         """Create comprehensive search patterns with multiple variations"""
@@ -275,6 +302,7 @@ class EnhancedInsuranceExtractor:
                     'confidence': best_result.confidence,
                     'method': best_result.method,
                     'context': best_result.context[:200] + '...' if len(best_result.context) > 200 else best_result.context,
+                    'position': best_result.position,
                     'found': True
                 }
                 self.logger.info(f"Found {field_name}: {best_result.value} (confidence: {best_result.confidence:.2f}, method: {best_result.method})")
@@ -285,6 +313,7 @@ class EnhancedInsuranceExtractor:
                     'confidence': 0.0,
                     'method': 'None',
                     'context': '',
+                    'position': 0,
                     'found': False
                 }
                 self.logger.warning(f"Could not find {field_name} in {filename}")
@@ -293,11 +322,10 @@ class EnhancedInsuranceExtractor:
     
     def extract_with_patterns(self, text: str, field_key: str) -> Optional[ExtractionResult]:
         """Extract using direct regex patterns"""
-        patterns = self.search_patterns.get(field_key, [])
+        patterns = self.compiled_patterns.get(field_key, [])
         
         for i, pattern in enumerate(patterns):
-            matches = list(re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE))
-            for match in matches:
+            for match in pattern.finditer(text):
                 value = match.group(1).strip() if match.groups() else match.group().strip()
                 if value and len(value) > 1:
                     cleaned_value = self.clean_value(value, field_key)
@@ -315,17 +343,14 @@ class EnhancedInsuranceExtractor:
     
     def extract_contextually(self, original_text: str, text_lower: str, field_key: str, aliases: List[str]) -> Optional[ExtractionResult]:
         """Extract by looking for values near field labels"""
-        for alias in aliases:
-            # Look for the alias followed by a separator and then the value
-            patterns = [
-                rf'{re.escape(alias.lower())}\s*:?\s*([A-Za-z0-9\s\.\-\/,]+?)(?:\n|$|[|])',
-                rf'{re.escape(alias.lower())}\s*[:\-]\s*([A-Za-z0-9\s\.\-\/,]+?)(?:\n|$|[|])',
-                rf'{re.escape(alias.lower())}\s+([A-Za-z0-9\s\.\-\/,]+?)(?:\n|$|[|])',
-            ]
-            
+        # Look for the alias followed by a separator and then the value
+        alias_patterns = self.compiled_alias_patterns.get(field_key)
+        if alias_patterns is None:
+            alias_patterns = [(alias, self.create_alias_patterns(alias)) for alias in aliases]
+        
+        for alias, patterns in alias_patterns:
             for pattern in patterns:
-                matches = list(re.finditer(pattern, text_lower, re.IGNORECASE | re.MULTILINE))
-                for match in matches:
+                for match in pattern.finditer(text_lower):
                     # Get the original case value from the original text
                     start, end = match.span(1)
                     value = original_text[start:end].strip()
@@ -360,15 +385,8 @@ class EnhancedInsuranceExtractor:
                         potential_line = lines[j]
                         
                         # Try different table extraction patterns
-                        table_patterns = [
-                            r'([^|\t]+)[\|\t]+([^|\t]+)', # Pipe or tab separated
-                            r'([^:]+):\s*([^:]+)', # Colon separated
-                            r'(.+?)\s{3,}(.+)', # Multiple spaces
-                        ]
-                        
-                        for pattern in table_patterns:
-                            matches = re.finditer(pattern, potential_line)
-                            for match in matches:
+                        for pattern in self.table_line_patterns:
+                            for match in pattern.finditer(potential_line):
                                 # Check both parts of the match
                                 part1, part2 = match.groups()
                                 
@@ -399,7 +417,7 @@ class EnhancedInsuranceExtractor:
         lines = original_text.split('\n')
         
         for i, line in enumerate(lines):
-            words = re.findall(r'\b\w+\b', line.lower())
+            words = self.word_pattern.findall(line.lower())
             line_text = ' '.join(words)
             
             # Check for fuzzy matches with aliases
@@ -417,7 +435,7 @@ class EnhancedInsuranceExtractor:
                         # Extract potential values using field-specific patterns
                         if field_key in ['net_od_premium', 'net_liability_premium', 'total_premium', 'gst_amount', 'gross_premium']:
                             # Look for monetary values
-                            money_matches = re.finditer(r'(?:rs\.?|₹|inr)?\s*([0-9,]+(?:\.[0-9]{2})?)', search_line, re.IGNORECASE)
+                            money_matches = self.money_pattern.finditer(search_line)
                             for match in money_matches:
                                 value = match.group(1)
                                 cleaned_value = self.clean_value(value, field_key)
@@ -433,7 +451,7 @@ class EnhancedInsuranceExtractor:
                                     )
                         elif field_key in ['policy_no', 'engine_no', 'chassis_no', 'cheque_no']:
                             # Look for alphanumeric codes
-                            code_matches = re.finditer(r'\b([A-Z0-9\-/]{4,})\b', search_line)
+                            code_matches = self.code_pattern.finditer(search_line)
                             for match in code_matches:
                                 value = match.group(1)
                                 cleaned_value = self.clean_value(value, field_key)
@@ -570,6 +588,9 @@ class EnhancedInsuranceExtractor:
     # Keep the existing Excel creation methods with enhancements
     def create_insurance_excel(self, extracted_data: List[Dict], output_path: str) -> bool:
         """Create an enhanced Excel file for insurance data with confidence scores"""
+        # Imported on first export rather than with the module, to keep app startup quick
+        import pandas as pd
+        
         try:
             excel_data = []
             
@@ -598,7 +619,10 @@ class EnhancedInsuranceExtractor:
             df = pd.DataFrame(excel_data)
             
             # Create Excel writer with multiple sheets
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+            # Extracted PDF text is written as plain strings, never as formulas, links or numbers
+            with pd.ExcelWriter(output_path, engine='xlsxwriter', engine_kwargs={'options': {
+                    'strings_to_urls': False, 'strings_to_formulas': False, 'strings_to_numbers': False
+            }}) as writer:
                 # Main data sheet
                 df.to_excel(writer, sheet_name='Insurance Data', index=False)
                 
@@ -703,92 +727,59 @@ class EnhancedInsuranceExtractor:
     def format_enhanced_excel_sheets(self, writer, main_df, summary_df, confidence_df):
         """Format Excel sheets with enhanced styling"""
         try:
-            from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+            from xlsxwriter.utility import xl_rowcol_to_cell
+            
+            workbook = writer.book
+            header_format = workbook.add_format({
+                'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#366092', 'align': 'center'
+            })
             
             # Colors for different confidence levels
-            high_confidence_fill = PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")  # Green
-            medium_confidence_fill = PatternFill(start_color="FFC107", end_color="FFC107", fill_type="solid")  # Amber
-            low_confidence_fill = PatternFill(start_color="F44336", end_color="F44336", fill_type="solid")  # Red
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(color="FFFFFF", bold=True)
+            high_confidence_format = workbook.add_format({'bg_color': '#4CAF50', 'font_color': '#FFFFFF', 'bold': True})  # Green
+            medium_confidence_format = workbook.add_format({'bg_color': '#FFC107', 'font_color': '#000000', 'bold': True})  # Amber
+            low_confidence_format = workbook.add_format({'bg_color': '#F44336', 'font_color': '#FFFFFF', 'bold': True})  # Red
             
             # Format main data sheet with confidence color coding
             ws_main = writer.sheets['Insurance Data']
+            ws_main.write_row(0, 0, list(main_df.columns), header_format)
             
-            # Header formatting
-            for cell in ws_main[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center")
-            
-            # Color-code confidence values
-            for row in range(2, ws_main.max_row + 1):
-                for col in range(1, ws_main.max_column + 1):
-                    cell = ws_main.cell(row=row, column=col)
-                    
-                    # Check if this is a confidence column
-                    if 'Confidence)' in str(ws_main.cell(row=1, column=col).value):
-                        try:
-                            confidence_value = float(cell.value)
-                            if confidence_value >= 0.8:
-                                cell.fill = high_confidence_fill
-                                cell.font = Font(color="FFFFFF", bold=True)
-                            elif confidence_value >= 0.5:
-                                cell.fill = medium_confidence_fill
-                                cell.font = Font(color="000000", bold=True)
-                            elif confidence_value > 0:
-                                cell.fill = low_confidence_fill
-                                cell.font = Font(color="FFFFFF", bold=True)
-                        except (ValueError, TypeError):
-                            pass
+            # Confidence values are written as text, so Excel converts them when testing each rule
+            last_row = len(main_df)
+            for col, column in enumerate(main_df.columns):
+                if 'Confidence)' not in str(column) or not last_row:
+                    continue
+                
+                value = f"VALUE({xl_rowcol_to_cell(1, col)})"
+                for criteria, cell_format in (
+                    (f"={value}>=0.8", high_confidence_format),
+                    (f"=AND({value}>=0.5,{value}<0.8)", medium_confidence_format),
+                    (f"=AND({value}>0,{value}<0.5)", low_confidence_format),
+                ):
+                    ws_main.conditional_format(1, col, last_row, col,
+                                               {'type': 'formula', 'criteria': criteria, 'format': cell_format})
             
             # Auto-adjust column widths
-            for column in ws_main.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                
-                adjusted_width = min(max_length + 2, 50)
-                ws_main.column_dimensions[column_letter].width = adjusted_width
-            
-            # Format summary sheet
-            ws_summary = writer.sheets['Summary']
-            for cell in ws_summary[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center")
-            
-            # Format confidence analysis sheet
-            ws_confidence = writer.sheets['Confidence Analysis']
-            for cell in ws_confidence[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center")
-            
-            # Auto-adjust widths for all sheets
-            for sheet in [ws_summary, ws_confidence]:
-                for column in sheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    
-                    adjusted_width = min(max_length + 2, 30)
-                    sheet.column_dimensions[column_letter].width = adjusted_width
+            for col, width in enumerate(self.column_widths(main_df, 50)):
+                ws_main.set_column(col, col, width)
+            
+            # Format summary and confidence analysis sheets, auto-adjusting their widths
+            for sheet_name, df in [('Summary', summary_df), ('Confidence Analysis', confidence_df)]:
+                sheet = writer.sheets[sheet_name]
+                sheet.write_row(0, 0, list(df.columns), header_format)
+                for col, width in enumerate(self.column_widths(df, 30)):
+                    sheet.set_column(col, col, width)
             
         except Exception as e:
             self.logger.warning(f"Could not format Excel sheets: {e}")
+    
+    def column_widths(self, df, max_width: int) -> List[int]:
+        """Size each column to its header or longest value, measured per column rather than per cell"""
+        widths = []
+        values = df.fillna('').astype(str)
+        for column in df.columns:
+            max_length = max(len(str(column)), int(values[column].str.len().max()) if len(values) else 0)
+            widths.append(min(max_length + 2, max_width))
+        return widths
 
 
 # Maintain backward compatibility
@@ -1053,11 +1053,11 @@ class OptimizedInsuranceGUI:
                     column_letter = column[0].column_letter
                     
                     for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
+                        value = cell.value
+                        if value is not None:
+                            cell_length = len(value) if isinstance(value, str) else len(str(value))
+                            if cell_length > max_length:
+                                max_length = cell_length
                     
                     adjusted_width = min(max_length + 2, 50)
                     worksheet.column_dimensions[column_letter].width = adjusted_width
@@ -7,24 +7,358 @@ A secure, local application for extracting specific data from PDF files and expo
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import pdfplumber
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment
-import pandas as pd
+import xlsxwriter
 import os
 import re
 import threading
+import queue
+import itertools
+import bisect
+import mmap
+import pathlib
+from contextlib import contextmanager
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future
+import multiprocessing
 from datetime import datetime
 import logging
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator
 import pytesseract
 from PIL import Image
 import io
 import platform
 import sys
+import sqlite3
+import hashlib
+import time
+import json
+import tempfile
+import zlib
 from insurance_extractor_mode import EnhancedInsuranceExtractor
 from idp_enhanced_extractor import IDPInsuranceExtractor
 
+# pdfium ships with pdfplumber (it backs page.to_image); its C text layer is used
+# for the optional fast text engine
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+# Hyperscan is optional; when present, literal search terms are matched with its multi-pattern DFA
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# PyMuPDF is optional; when present, OCR pages are rasterized with MuPDF instead of pdfplumber
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+# zstandard is optional; extracted-text cache files fall back to zlib without it
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# tesserocr is optional; when present, OCR runs in-process on long-lived tesseract
+# instances instead of starting a tesseract subprocess (and reloading its model) per page
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+# OpenCV is optional; when present, pages are binarized with its SIMD Otsu threshold before OCR
+try:
+    import cv2
+    import numpy as np
+    # Pages are already processed in parallel by the OCR pool
+    cv2.setNumThreads(1)
+except ImportError:
+    cv2 = None
+    np = None
+
+# Tesseract is a separate process per call, so OCR pages can run concurrently.
+# OCR_CONCURRENCY in the environment caps this, e.g. to leave cores for other work.
+try:
+    OCR_WORKERS = max(1, int(os.environ.get('OCR_CONCURRENCY') or os.cpu_count() or 1))
+except ValueError:
+    OCR_WORKERS = os.cpu_count() or 1
+
+# How often queued worker updates are applied to the UI
+UI_DRAIN_INTERVAL_MS = 50
+
+# Leading pages whose text decides whether a document needs OCR
+OCR_SAMPLE_PAGES = 2
+
+# Text extraction strategy by document size, first match wins:
+# (max pages, max file size in MB or None for any size, strategy)
+EXTRACTION_STRATEGIES = [
+    (10, 0.5, 'sequential'),
+    (50, None, 'threaded'),
+    (500, None, 'streamed'),
+]
+# Documents beyond every rule are split across processes in ranges of this many pages
+PROCESS_CHUNK_PAGES = 50
+# Threads used by the 'threaded' strategy, each with its own document handle
+TEXT_THREAD_WORKERS = 4
+# When several files are selected, those up to this size are extracted ahead in worker processes
+PREFETCH_MAX_SIZE_MB = 5
+
+# Pages per tesseract run when OCR goes through pytesseract; tesseract can hang on long image lists
+OCR_BATCH_PAGES = 50
+
+# Resolution pages are rendered at for OCR
+OCR_DPI = 300
+
+# Pages are first OCR'd at this resolution, and again at OCR_DPI only when
+# tesseract's mean word confidence falls below OCR_MIN_CONFIDENCE
+OCR_DRAFT_DPI = 150
+OCR_MIN_CONFIDENCE = 70
+
+# Pages of an OCR'd document with at least this much embedded text keep it instead of being OCR'd
+TEXT_LAYER_MIN_CHARS = 50
+
+# Common tesseract misreads in IDs: the letter O touching digits, and a space splitting
+# the ID into equal-length groups. Only the uppercase value after an ID label is fixed,
+# as amounts, dates, table columns and words elsewhere are legitimately space-separated
+OCR_ID_VALUE = re.compile(
+    r'(\b(?i:policy|certificate|engine|chassis|cheque|registration)[ \t]*(?i:no|number)\.?[ \t]*:?[ \t]*)'
+    r'([A-Z/\-]*\d[A-Z0-9/\-]*(?:[ \t]+[A-Z]*\d[A-Z0-9]*(?=\s|$))*)')
+OCR_ID_SEPARATOR = re.compile(r'([ \t]+)')
+OCR_LETTER_O_IN_NUMBER = re.compile(r'(?<=\d)O|O(?=\d)')
+
+# Persistent OCR results, keyed by page image hash
+OCR_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'pdf_extractor', 'ocr_cache.sqlite')
+OCR_CACHE_MAX_ROWS = 100000
+
+# Extracted page text per document, so re-runs with different search terms skip extraction
+TEXT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'pdf_extractor', 'text')
+TEXT_CACHE_MAX_FILES = 2000
+
+
+class OCRCache:
+    """SQLite-backed store of OCR text keyed by (image hash, tesseract version, language, config)"""
+    
+    def __init__(self, db_path: str = OCR_CACHE_PATH, max_rows: int = OCR_CACHE_MAX_ROWS):
+        self.logger = logging.getLogger(__name__)
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._conn = None
+        
+        try:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            # One connection is shared by the OCR worker threads under self._lock;
+            # WAL lets several running instances of the app read while one writes
+            self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=10)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "hash TEXT NOT NULL, tesseract_version TEXT NOT NULL, lang TEXT NOT NULL, config TEXT NOT NULL, "
+                "text TEXT NOT NULL, last_used_ts REAL NOT NULL, "
+                "PRIMARY KEY (hash, tesseract_version, lang, config))")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_last_used ON cache (last_used_ts)")
+            self._conn.commit()
+        except Exception as e:
+            self.logger.warning(f"OCR cache disabled: {e}")
+            self._conn = None
+    
+    @staticmethod
+    def image_hash(pil_image) -> str:
+        """Hash the rendered page pixels (plus mode and size, so equal bytes of different shapes differ)"""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{pil_image.mode}:{pil_image.size}".encode())
+        digest.update(pil_image.tobytes())
+        return digest.hexdigest()
+    
+    def get(self, key: Tuple[str, str, str, str]) -> Optional[str]:
+        """Return cached text for key, marking it as recently used"""
+        if self._conn is None:
+            return None
+        
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT text FROM cache WHERE hash=? AND tesseract_version=? AND lang=? AND config=?",
+                    key).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE cache SET last_used_ts=? WHERE hash=? AND tesseract_version=? AND lang=? AND config=?",
+                        (time.time(),) + tuple(key))
+                    self._conn.commit()
+            return row[0] if row is not None else None
+        except Exception as e:
+            self.logger.warning(f"OCR cache lookup failed: {e}")
+            return None
+    
+    def put(self, key: Tuple[str, str, str, str], text: str):
+        """Store OCR text for key"""
+        if self._conn is None:
+            return
+        
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (hash, tesseract_version, lang, config, text, last_used_ts) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    tuple(key) + (text, time.time()))
+                self._conn.commit()
+        except Exception as e:
+            self.logger.warning(f"OCR cache write failed: {e}")
+    
+    def prune(self):
+        """Evict least recently used rows beyond max_rows"""
+        if self._conn is None:
+            return
+        
+        try:
+            with self._lock:
+                count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+                if count > self.max_rows:
+                    self._conn.execute(
+                        "DELETE FROM cache WHERE rowid IN "
+                        "(SELECT rowid FROM cache ORDER BY last_used_ts LIMIT ?)",
+                        (count - self.max_rows,))
+                    self._conn.commit()
+        except Exception as e:
+            self.logger.warning(f"OCR cache prune failed: {e}")
+
+
+class TextCache:
+    """Compressed on-disk store of a document's extracted pages, keyed by file hash and extraction options"""
+    
+    def __init__(self, cache_dir: str = TEXT_CACHE_DIR, max_files: int = TEXT_CACHE_MAX_FILES):
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        self.max_files = max_files
+        self.extension = '.json.zst' if zstandard is not None else '.json.z'
+        
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except Exception as e:
+            self.logger.warning(f"Text cache disabled: {e}")
+            self.cache_dir = None
+    
+    def key_for(self, file_path: str, options: Dict) -> Optional[str]:
+        """Hash the file contents in chunks and combine with the options that change extracted text"""
+        if self.cache_dir is None:
+            return None
+        
+        try:
+            digest = hashlib.blake2b(digest_size=20)
+            with open(file_path, 'rb') as pdf_file:
+                for chunk in iter(lambda: pdf_file.read(1024 * 1024), b''):
+                    digest.update(chunk)
+        except Exception as e:
+            self.logger.warning(f"Could not hash {file_path} for the text cache: {e}")
+            return None
+        
+        fast_text = options['fast_text'] and pdfium is not None
+        flags = f"f{int(options['force_ocr'])}a{int(options['auto_ocr'])}p{int(fast_text)}"
+        return f"{digest.hexdigest()}_{flags}"
+    
+    def contains(self, key: Optional[str]) -> bool:
+        """Return whether an entry is stored for key, without reading it"""
+        return key is not None and os.path.exists(os.path.join(self.cache_dir, key + self.extension))
+    
+    def get(self, key: Optional[str]) -> Optional[Tuple[List[Tuple[int, str]], str]]:
+        """Return (pages, extraction_method) stored for key"""
+        if key is None:
+            return None
+        
+        path = os.path.join(self.cache_dir, key + self.extension)
+        try:
+            with open(path, 'rb') as cache_file:
+                data = cache_file.read()
+        except FileNotFoundError:
+            return None
+        
+        try:
+            if zstandard is not None:
+                data = zstandard.ZstdDecompressor().decompress(data)
+            else:
+                data = zlib.decompress(data)
+            entry = json.loads(data)
+            os.utime(path)  # Mark as recently used for pruning
+            return [tuple(page) for page in entry['pages']], entry['extraction_method']
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable text cache entry {path}: {e}")
+            return None
+    
+    def put(self, key: Optional[str], pages: List[Tuple[int, str]], extraction_method: str):
+        """Store a document's pages for key"""
+        if key is None:
+            return
+        
+        path = os.path.join(self.cache_dir, key + self.extension)
+        try:
+            data = json.dumps({'extraction_method': extraction_method, 'pages': pages}).encode('utf-8')
+            if zstandard is not None:
+                data = zstandard.ZstdCompressor(level=3).compress(data)
+            else:
+                data = zlib.compress(data, 3)
+            
+            # Write then rename, so a concurrent reader never sees a partial file
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as cache_file:
+                cache_file.write(data)
+            os.replace(temp_path, path)
+        except Exception as e:
+            self.logger.warning(f"Text cache write failed: {e}")
+    
+    def prune(self):
+        """Delete the least recently used entries beyond max_files"""
+        if self.cache_dir is None:
+            return
+        
+        try:
+            entries = [entry for entry in os.scandir(self.cache_dir) if entry.is_file()]
+            if len(entries) > self.max_files:
+                entries.sort(key=lambda entry: entry.stat().st_mtime)
+                for entry in entries[:len(entries) - self.max_files]:
+                    os.remove(entry.path)
+        except Exception as e:
+            self.logger.warning(f"Text cache prune failed: {e}")
+
+
+def extract_page_range(file_path: str, first_page: int, last_page: int) -> List[Tuple[int, str]]:
+    """Extract (page_num, text) for pages first_page..last_page from a fresh document handle"""
+    with pdfplumber.open(file_path, pages=list(range(first_page, last_page + 1))) as pdf:
+        return [(page.page_number, page.extract_text() or "") for page in pdf.pages]
+
+
+def extract_document_text(file_path: str) -> List[Tuple[int, str]]:
+    """Extract (page_num, text) for every page of a document, for running in a worker process"""
+    with pdfplumber.open(file_path) as pdf:
+        return [(page.page_number, page.extract_text() or "") for page in pdf.pages]
+
+
+def postprocess_ocr_text(text: str) -> str:
+    """Fix common OCR misreads in the IDs on a page so they match the search terms"""
+    return OCR_ID_VALUE.sub(lambda match: match.group(1) + fix_ocr_id(match.group(2)), text)
+
+
+def fix_ocr_id(value: str) -> str:
+    """Join the groups of an ID split by spaces and turn O touching digits into 0"""
+    # Only groups as long as the first are taken as part of the ID; anything
+    # after the first shorter or longer group (e.g. "1 year") is left alone
+    parts = OCR_ID_SEPARATOR.split(value)
+    group_count = 1
+    while group_count * 2 < len(parts) and len(parts[group_count * 2]) == len(parts[0]):
+        group_count += 1
+    
+    id_value = OCR_LETTER_O_IN_NUMBER.sub('0', ''.join(parts[0:group_count * 2:2]))
+    return id_value + ''.join(parts[group_count * 2 - 1:])
+
+
 class PDFDataExtractor:
+    # Both extractors compile their patterns on construction and keep no per-file
+    # state, so a single instance of each is shared by every window
+    insurance_extractor = EnhancedInsuranceExtractor()
+    idp_extractor = IDPInsuranceExtractor()
+    
     def __init__(self, root):
         self.root = root
         self.root.title("PDF Data Extractor - IDP/ICR Enhanced")
@@ -37,22 +371,39 @@ class PDFDataExtractor:
         # Initialize variables
         self.selected_files = []
         self.search_terms = []
+        self.search_matcher = None
+        self.options = {}  # Snapshot of the UI options, taken on the Tk thread when processing starts
         self.extracted_data = []
+        self.stats = {}  # Extraction strategy -> number of files it was used for
+        self.prefetched = {}  # File path -> Future of its page texts, extracted ahead in a worker process
         self.is_processing = False
         self.insurance_mode = False
         self.idp_mode = False
         
-        # Initialize both extractors
-        self.insurance_extractor = EnhancedInsuranceExtractor()
-        self.idp_extractor = IDPInsuranceExtractor()
+        # OCR worker synchronisation
+        self._render_lock = threading.Lock()
+        self._ocr_progress_lock = threading.Lock()
+        self._ocr_pages_done = 0
+        self._tess_apis = queue.Queue()  # Idle tesserocr instances, reused across pages and files
+        
+        # Updates from the processing thread, applied in batches on the Tk thread
+        self.ui_queue = queue.Queue()
         
         # Setup OCR for bundled environment
+        self.tesseract_version = 'unknown'
         self.setup_ocr_environment()
+        self.ocr_cache = OCRCache()
+        self.text_cache = TextCache()
         
         self.setup_ui()
+        self.root.after(UI_DRAIN_INTERVAL_MS, self._drain_ui_queue)
     
     def setup_ocr_environment(self):
         """Configure OCR paths for both development and bundled environments"""
+        # Keep each tesseract process single-threaded; pages are OCR'd in parallel instead,
+        # so letting every worker spawn its own OpenMP pool would oversubscribe the CPU
+        os.environ['OMP_THREAD_LIMIT'] = '1'
+        
         try:
             # Check if running as a PyInstaller bundle
             if hasattr(sys, '_MEIPASS'):
@@ -99,6 +450,7 @@ class PDFDataExtractor:
             # Test OCR functionality
             try:
                 version = pytesseract.get_tesseract_version()
+                self.tesseract_version = str(version)
                 self.logger.info(f"OCR ready - Tesseract version: {version}")
             except Exception as e:
                 self.logger.error(f"OCR setup failed: {e}")
@@ -166,6 +518,7 @@ class PDFDataExtractor:
         self.context_var = tk.BooleanVar(value=True)
         self.force_ocr_var = tk.BooleanVar()
         self.auto_ocr_var = tk.BooleanVar(value=True)
+        self.fast_text_var = tk.BooleanVar()
         self.insurance_mode_var = tk.BooleanVar()
         self.idp_mode_var = tk.BooleanVar()
         
@@ -232,6 +585,13 @@ class PDFDataExtractor:
                             font=('Helvetica', 9))
         ocr_help.grid(row=5, column=0, columnspan=2, sticky=tk.W, pady=(3, 0))
         
+        # Fast text engine (PDFium) - only offered when pypdfium2 is available
+        self.fast_text_check = ttk.Checkbutton(options_frame, text="Fast text engine (PDFium)", 
+                                             variable=self.fast_text_var)
+        self.fast_text_check.grid(row=5, column=2, columnspan=2, sticky=tk.W, pady=(3, 0))
+        if pdfium is None:
+            self.fast_text_check.config(state=tk.DISABLED)
+        
         # Process button
         self.process_button = ttk.Button(main_frame, text="Extract Data", 
                                         command=self.start_processing, style='Accent.TButton')
@@ -421,6 +781,13 @@ Body type"""
             # Insurance or IDP mode - we'll use the respective extractors
             self.search_terms = []  # Not used in these modes
         
+        # Worker threads read this snapshot instead of the Tk variables
+        try:
+            self.options = self.snapshot_options()
+        except ValueError:
+            messagebox.showerror("Error", "Context length must be a whole number.")
+            return
+        
         # Disable process button and start processing
         self.process_button.config(state=tk.DISABLED)
         self.export_button.config(state=tk.DISABLED)
@@ -431,303 +798,958 @@ Body type"""
         thread.daemon = True
         thread.start()
     
+    def snapshot_options(self) -> Dict:
+        """Read every processing option from the UI once"""
+        include_context = self.context_var.get()
+        return {
+            'case_sensitive': self.case_sensitive_var.get(),
+            'whole_words': self.whole_words_var.get(),
+            'regex': self.regex_var.get(),
+            'include_context': include_context,
+            'context_length': int(self.context_length.get() or 100) if include_context else 0,
+            'force_ocr': self.force_ocr_var.get(),
+            'auto_ocr': self.auto_ocr_var.get(),
+            'fast_text': self.fast_text_var.get(),
+            'idp_mode': self.idp_mode_var.get(),
+            'insurance_mode': self.insurance_mode_var.get()
+        }
+    
     def process_files(self):
         """Process all selected PDF files"""
         try:
             self.extracted_data.clear()
             total_files = len(self.selected_files)
+            options = self.options
             
-            for i, file_path in enumerate(self.selected_files):
-                if not self.is_processing:
-                    break
-                
-                self.root.after(0, lambda: self.status_label.config(
-                    text=f"Processing: {os.path.basename(file_path)} ({i+1}/{total_files})"))
-                
-                # Update progress bar
-                progress = (i / total_files) * 100
-                self.root.after(0, lambda p=progress: self.progress_var.set(p))
-                
-                try:
-                    file_results = self.extract_from_pdf(file_path)
-                    self.extracted_data.extend(file_results)
-                except Exception as e:
-                    self.logger.error(f"Error processing {file_path}: {str(e)}")
-                    self.root.after(0, lambda err=str(e), file=file_path: 
-                                   self.results_text.insert(tk.END, 
-                                   f"Error processing {os.path.basename(file)}: {err}\n"))
+            # Compile the search terms once for the whole run
+            if self.search_terms:
+                self.search_matcher = self.compile_search_terms(self.search_terms, options)
+            
+            cache_keys = {file_path: self.text_cache.key_for(file_path, options) for file_path in self.selected_files}
+            prefetch_executor = self.prefetch_texts(self.selected_files, cache_keys, options)
+            try:
+                for i, file_path in enumerate(self.selected_files):
+                    if not self.is_processing:
+                        break
+                    
+                    self.ui_queue.put(("status", f"Processing: {os.path.basename(file_path)} ({i+1}/{total_files})"))
+                    
+                    # Update progress bar
+                    self.ui_queue.put(("progress", (i / total_files) * 100))
+                    
+                    try:
+                        file_results = self.extract_from_pdf(file_path, options, cache_keys[file_path])
+                        self.extracted_data.extend(file_results)
+                    except Exception as e:
+                        self.logger.error(f"Error processing {file_path}: {str(e)}")
+                        self.ui_queue.put(("result", f"Error processing {os.path.basename(file_path)}: {str(e)}\n"))
+            finally:
+                # Don't extract files that won't be used if processing was stopped
+                if prefetch_executor is not None:
+                    prefetch_executor.shutdown(wait=False, cancel_futures=True)
+                self.prefetched = {}
             
             # Complete
-            self.root.after(0, lambda: self.progress_var.set(100))
-            self.root.after(0, self.processing_complete)
+            self.text_cache.prune()
+            self.logger.info(f"Extraction strategies used so far: {self.stats}")
+            self.ui_queue.put(("progress", 100))
+            self.ui_queue.put(("call", self.processing_complete))
             
         except Exception as e:
             self.logger.error(f"Processing error: {str(e)}")
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Processing failed: {str(e)}"))
-            self.root.after(0, self.reset_ui)
+            error_message = f"Processing failed: {str(e)}"
+            self.ui_queue.put(("call", lambda: messagebox.showerror("Error", error_message)))
+            self.ui_queue.put(("call", self.reset_ui))
+    
+    def prefetch_texts(self, file_paths: List[str], cache_keys: Dict[str, Optional[str]],
+                       options: Dict) -> Optional[ProcessPoolExecutor]:
+        """Start extracting small, uncached files in worker processes, one document per task
+        
+        Files are still searched in order on this thread; each one picks up its text from self.prefetched.
+        """
+        self.prefetched = {}
+        if options['force_ocr'] or (options['fast_text'] and pdfium is not None):
+            return None
+        
+        eligible = []
+        for file_path in dict.fromkeys(file_paths):
+            try:
+                size_mb = os.path.getsize(file_path) / (1024 * 1024)
+            except OSError:
+                continue
+            if size_mb <= PREFETCH_MAX_SIZE_MB and not self.text_cache.contains(cache_keys[file_path]):
+                eligible.append(file_path)
+        
+        # A single document doesn't make up for starting the worker processes
+        if len(eligible) < 2:
+            return None
+        
+        # Spawned rather than forked, since this runs on a worker thread next to Tk
+        executor = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context('spawn'))
+        self.prefetched = {file_path: executor.submit(extract_document_text, file_path) for file_path in eligible}
+        return executor
+    
+    def _drain_ui_queue(self):
+        """Apply all queued worker updates, then reschedule"""
+        items = []
+        while True:
+            try:
+                items.append(self.ui_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        if items:
+            self._apply_ui_updates(items)
+        self.root.after(UI_DRAIN_INTERVAL_MS, self._drain_ui_queue)
     
-    def extract_from_pdf(self, file_path: str) -> List[Dict]:
+    def _apply_ui_updates(self, items: List[Tuple]):
+        """Collapse a batch of updates into one status change, one progress change and one text insert"""
+        status = None
+        progress = None
+        result_lines = []
+        
+        def flush():
+            if result_lines:
+                self.results_text.insert(tk.END, "".join(result_lines))
+                result_lines.clear()
+            if progress is not None:
+                self.progress_var.set(progress)
+            if status is not None:
+                self.status_label.config(text=status)
+        
+        for kind, value in items:
+            if kind == "status":
+                status = value
+            elif kind == "progress":
+                progress = value
+            elif kind == "result":
+                result_lines.append(value)
+            elif kind == "call":
+                # Callbacks may read or reset the widgets, so apply everything queued before them first
+                flush()
+                status = progress = None
+                value()
+        
+        flush()
+    
+    def extract_from_pdf(self, file_path: str, options: Dict, cache_key: Optional[str] = None) -> List[Dict]:
         """Extract data from a single PDF file with OCR support"""
         results = []
         filename = os.path.basename(file_path)
         
         try:
-            with pdfplumber.open(file_path) as pdf:
-                full_text = ""
-                page_texts = {}
-                total_chars = 0
-                
-                # First, try normal text extraction (unless forcing OCR)
-                if not self.force_ocr_var.get():
-                    self.root.after(0, lambda: self.status_label.config(
-                        text=f"Extracting text from {filename}..."))
-                    
-                    for page_num, page in enumerate(pdf.pages, 1):
-                        page_text = page.extract_text()
-                        if page_text:
-                            page_texts[page_num] = page_text
-                            full_text += f"\n--- Page {page_num} ---\n" + page_text
-                            total_chars += len(page_text.strip())
-                
-                # Check if we need OCR (low text content or forced OCR)
-                avg_chars_per_page = total_chars / max(len(pdf.pages), 1) if pdf.pages else 0
-                need_ocr = (
-                    self.force_ocr_var.get() or 
-                    (self.auto_ocr_var.get() and avg_chars_per_page < 50)
-                )
-                
-                if need_ocr:
-                    self.root.after(0, lambda: self.status_label.config(
-                        text=f"OCR processing {filename} - may take longer..."))
-                    
-                    # Perform OCR extraction
-                    ocr_texts = self.extract_text_with_ocr(pdf, filename)
-                    
-                    # Use OCR results if we got more text, or if forcing OCR
-                    if self.force_ocr_var.get() or len(''.join(ocr_texts.values())) > total_chars:
-                        page_texts = ocr_texts
-                        full_text = ""
-                        for page_num in sorted(page_texts.keys()):
-                            full_text += f"\n--- Page {page_num} ---\n" + page_texts[page_num]
-                        
-                        self.logger.info(f"Using OCR results for {filename}")
-                        extraction_method = "OCR"
-                    else:
-                        self.logger.info(f"Normal text extraction sufficient for {filename}")
-                        extraction_method = "Normal"
-                else:
-                    extraction_method = "Normal"
+            # IDP and insurance extraction work on the whole document; normal
+            # search scans pages as they are extracted
+            whole_document = options['idp_mode'] or options['insurance_mode']
+            
+            # Searching is cheap next to extraction and OCR, so re-runs on the same
+            # file reuse its extracted text
+            if cache_key is None:
+                cache_key = self.text_cache.key_for(file_path, options)
+            cached = self.text_cache.get(cache_key)
+            if cached is not None:
+                pages, extraction_method = cached
+                matches = [] if whole_document else self.find_matches(pages, options)
+                self.logger.info(f"Using cached text for {filename}")
+            else:
+                pages, matches, extraction_method = self.read_document_text(file_path, filename, options, whole_document)
+                # Don't remember a failed extraction (e.g. OCR unavailable), so it's retried next run
+                if any(page_text for _, page_text in pages):
+                    self.text_cache.put(cache_key, pages, extraction_method)
+            
+            # Only the whole-document modes need the pages joined into one string
+            full_text, page_starts = self.join_pages(pages) if whole_document else ('', [])
+            
+            # Handle insurance mode vs IDP mode vs normal search mode
+            if options['idp_mode']:
+                # IDP Mode - use comprehensive extraction with 100% coverage
+                idp_results = self.idp_extractor.extract_with_100_percent_coverage(full_text, filename)
                 
-                # Handle insurance mode vs IDP mode vs normal search mode
-                if self.idp_mode_var.get():
-                    # IDP Mode - use comprehensive extraction with 100% coverage
-                    idp_results = self.idp_extractor.extract_with_100_percent_coverage(full_text, filename)
-                    
-                    # Convert IDP results to results format
-                    for field_key, field_data in idp_results['required_fields'].items():
-                        if field_data['best_match']:
-                            result = {
-                                'filename': filename,
-                                'search_term': field_data['field_name'],
-                                'page': 'Multiple',  # IDP fields can be on any page
-                                'context': field_data['best_match'].context,
-                                'match': field_data['best_match'].value,
-                                'extraction_method': f"IDP-{field_data['best_match'].method}",
-                                'confidence': field_data['best_match'].confidence,
-                                'validation_score': field_data['best_match'].validation_score,
-                                'idp_field': field_key,
-                                'field_type': field_data.get('field_type', 'unknown')
-                            }
-                            results.append(result)
-                    
-                    # Add unmatched data for manual review
-                    unmatched = idp_results['unmatched_candidates']
-                    for amount in unmatched.get('unmatched_monetary_amounts', [])[:5]:  # Limit to 5
+                # Convert IDP results to results format
+                for field_key, field_data in idp_results['required_fields'].items():
+                    if field_data['best_match']:
                         result = {
                             'filename': filename,
-                            'search_term': 'UNMATCHED Monetary Amount',
-                            'page': 'Multiple',
-                            'context': amount.get('context', ''),
-                            'match': amount['value'],
-                            'extraction_method': 'IDP-Unmatched',
-                            'confidence': 0.0,
-                            'validation_score': 0.0,
-                            'idp_field': 'unmatched_monetary',
-                            'field_type': 'monetary'
+                            'search_term': field_data['field_name'],
+                            'page': 'Multiple',  # IDP fields can be on any page
+                            'context': field_data['best_match'].context,
+                            'match': field_data['best_match'].value,
+                            'extraction_method': f"IDP-{field_data['best_match'].method}",
+                            'confidence': field_data['best_match'].confidence,
+                            'validation_score': field_data['best_match'].validation_score,
+                            'idp_field': field_key,
+                            'field_type': field_data.get('field_type', 'unknown')
                         }
                         results.append(result)
-                    
-                    for code in unmatched.get('unmatched_codes', [])[:5]:  # Limit to 5
+                
+                # Add unmatched data for manual review
+                unmatched = idp_results['unmatched_candidates']
+                for amount in unmatched.get('unmatched_monetary_amounts', [])[:5]:  # Limit to 5
+                    result = {
+                        'filename': filename,
+                        'search_term': 'UNMATCHED Monetary Amount',
+                        'page': 'Multiple',
+                        'context': amount.get('context', ''),
+                        'match': amount['value'],
+                        'extraction_method': 'IDP-Unmatched',
+                        'confidence': 0.0,
+                        'validation_score': 0.0,
+                        'idp_field': 'unmatched_monetary',
+                        'field_type': 'monetary'
+                    }
+                    results.append(result)
+                
+                for code in unmatched.get('unmatched_codes', [])[:5]:  # Limit to 5
+                    result = {
+                        'filename': filename,
+                        'search_term': 'UNMATCHED Code',
+                        'page': 'Multiple',
+                        'context': code.get('context', ''),
+                        'match': code['value'],
+                        'extraction_method': 'IDP-Unmatched',
+                        'confidence': 0.0,
+                        'validation_score': 0.0,
+                        'idp_field': 'unmatched_code',
+                        'field_type': 'code'
+                    }
+                    results.append(result)
+                
+                # Store full IDP results for Excel export
+                results.append({
+                    'filename': filename,
+                    'idp_full_results': idp_results,
+                    'is_idp_metadata': True
+                })
+                
+                # Status update
+                found_count = sum(1 for field in idp_results['required_fields'].values() if field['best_match'])
+                total_fields = len(idp_results['required_fields'])
+                quality = idp_results['quality_metrics']
+                
+                self.ui_queue.put(("result",
+                                   f"🎯 IDP: {filename} - Found {found_count}/{total_fields} fields "
+                                   f"(Quality: {quality['success_rate']:.1f}%)\n"))
+            
+            elif options['insurance_mode']:
+                # Insurance Mode - use specialized extraction
+                insurance_data = self.insurance_extractor.extract_insurance_data(full_text, filename)
+                
+                # Convert insurance data to results format
+                for field_key, field_info in insurance_data.items():
+                    if field_info['found']:
                         result = {
                             'filename': filename,
-                            'search_term': 'UNMATCHED Code',
-                            'page': 'Multiple',
-                            'context': code.get('context', ''),
-                            'match': code['value'],
-                            'extraction_method': 'IDP-Unmatched',
-                            'confidence': 0.0,
-                            'validation_score': 0.0,
-                            'idp_field': 'unmatched_code',
-                            'field_type': 'code'
+                            'search_term': field_info['field_name'],
+                            'page': self.page_at_offset(field_info.get('position', 0), page_starts),
+                            'context': f"Found: {field_info['value']}",
+                            'match': field_info['value'],
+                            'extraction_method': extraction_method,
+                            'insurance_field': field_key
                         }
                         results.append(result)
-                    
-                    # Store full IDP results for Excel export
-                    results.append({
-                        'filename': filename,
-                        'idp_full_results': idp_results,
-                        'is_idp_metadata': True
-                    })
-                    
-                    # Status update
-                    found_count = sum(1 for field in idp_results['required_fields'].values() if field['best_match'])
-                    total_fields = len(idp_results['required_fields'])
-                    quality = idp_results['quality_metrics']
-                    
-                    self.root.after(0, lambda f=found_count, t=total_fields, q=quality, fn=filename: 
-                                   self.results_text.insert(tk.END, 
-                                   f"🎯 IDP: {fn} - Found {f}/{t} fields (Quality: {q['success_rate']:.1f}%)\n"))
                 
-                elif self.insurance_mode_var.get():
-                    # Insurance Mode - use specialized extraction
-                    insurance_data = self.insurance_extractor.extract_insurance_data(full_text, filename)
-                    
-                    # Convert insurance data to results format
-                    for field_key, field_info in insurance_data.items():
-                        if field_info['found']:
-                            result = {
-                                'filename': filename,
-                                'search_term': field_info['field_name'],
-                                'page': 'Multiple',  # Insurance fields can be on any page
-                                'context': f"Found: {field_info['value']}",
-                                'match': field_info['value'],
-                                'extraction_method': extraction_method,
-                                'insurance_field': field_key
-                            }
-                            results.append(result)
-                    
-                    # Add summary info
-                    found_count = sum(1 for field in insurance_data.values() if field['found'])
-                    total_fields = len(insurance_data)
-                    
-                    self.root.after(0, lambda f=found_count, t=total_fields, fn=filename: 
-                                   self.results_text.insert(tk.END, 
-                                   f"🏢 {fn}: Found {f}/{t} insurance fields\n"))
+                # Add summary info
+                found_count = sum(1 for field in insurance_data.values() if field['found'])
+                total_fields = len(insurance_data)
                 
-                else:
-                    # Normal Mode - search for each term
-                    for search_term in self.search_terms:
-                        matches = self.find_matches(full_text, search_term, page_texts)
-                        
-                        for match in matches:
-                            result = {
-                                'filename': filename,
-                                'filepath': file_path,
-                                'search_term': search_term,
-                                'page_number': match.get('page', 'Unknown'),
-                                'match_text': match.get('match', ''),
-                                'context': match.get('context', ''),
-                                'extraction_method': extraction_method,
-                                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                            }
-                            results.append(result)
-        
+                self.ui_queue.put(("result", f"🏢 {filename}: Found {found_count}/{total_fields} insurance fields\n"))
+            
+            else:
+                # Normal Mode - matches were collected while the pages streamed in
+                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                results.extend({
+                    'filename': filename,
+                    'filepath': file_path,
+                    'search_term': search_term,
+                    'page_number': page,
+                    'match_text': match_text,
+                    'context': context,
+                    'extraction_method': extraction_method,
+                    'timestamp': timestamp
+                } for search_term, page, match_text, context, _ in matches)
+    
         except Exception as e:
             self.logger.error(f"Error extracting from {file_path}: {str(e)}")
             raise
         
         return results
     
-    def extract_text_with_ocr(self, pdf, filename: str) -> Dict[int, str]:
-        """Extract text from PDF using OCR"""
-        page_texts = {}
+    def read_document_text(self, file_path: str, filename: str, options: Dict,
+                           whole_document: bool) -> Tuple[List[Tuple[int, str]], List[Tuple], str]:
+        """Extract a document's page text, with OCR when needed, returning (pages, matches, extraction_method)
+        
+        In normal mode the pages are searched while they are extracted and the matches returned;
+        whole-document modes get no matches.
+        """
+        with self.open_pdf(file_path) as pdf:
+            pages = []
+            matches = []
+            text_stats = {'chars': 0}
+            page_stream = None
+            sample = []
+            text_layer_pages = None
+            
+            strategy = self.select_strategy(pdf, file_path, options)
+            prefetched = self.prefetched.pop(file_path, None)
+            stats_key = 'prefetched' if prefetched is not None else strategy
+            self.stats[stats_key] = self.stats.get(stats_key, 0) + 1
+            
+            # First, try normal text extraction (unless forcing OCR)
+            if strategy != 'ocr':
+                self.ui_queue.put(("status", f"Extracting text from {filename}..."))
+                
+                # Only the first pages are extracted up front to decide on OCR;
+                # the rest are extracted once that decision is made
+                page_stream = self.iter_page_texts(pdf, file_path, text_stats, strategy, prefetched)
+                sample = list(itertools.islice(page_stream, OCR_SAMPLE_PAGES))
+            
+            # Check if we need OCR (low text content or forced OCR)
+            avg_chars_per_page = text_stats['chars'] / len(sample) if sample else 0
+            need_ocr = (
+                options['force_ocr'] or 
+                (options['auto_ocr'] and avg_chars_per_page < 50)
+            )
+            use_ocr = False
+            
+            if need_ocr:
+                self.ui_queue.put(("status", f"OCR processing {filename} - may take longer..."))
+                
+                # The rest of the text layer is read once, by the chosen strategy, and shared
+                # by the OCR pass (to skip pages that have text) and the normal path below
+                if page_stream is not None:
+                    text_layer_pages = sample + list(page_stream)
+                
+                # Perform OCR extraction
+                ocr_texts = self.extract_text_with_ocr(pdf, filename, file_path, text_layer_pages)
+                
+                # Use OCR results if they got more text out of the sampled pages, or if forcing OCR;
+                # other pages with a text layer keep it either way, so they aren't compared
+                sample_chars = sum(len(page_text.strip()) for _, page_text in sample)
+                ocr_sample_chars = sum(len(ocr_texts.get(page_num, '').strip()) for page_num, _ in sample)
+                use_ocr = options['force_ocr'] or ocr_sample_chars > sample_chars
+                if use_ocr:
+                    if page_stream is not None:
+                        page_stream.close()
+                    pages = sorted(ocr_texts.items())
+                    if not whole_document:
+                        matches = self.find_matches(pages, options)
+                    
+                    self.logger.info(f"Using OCR results for {filename}")
+                    extraction_method = "OCR"
+                else:
+                    self.logger.info(f"Normal text extraction sufficient for {filename}")
+            
+            if not use_ocr:
+                extraction_method = "Normal"
+                if text_layer_pages is None:
+                    text_layer_pages = itertools.chain(sample, page_stream or ())
+                text_pages = (page for page in text_layer_pages if page[1])
+                if whole_document:
+                    pages = list(text_pages)
+                else:
+                    # Keep the pages as they stream past the search, for the text cache
+                    matches = self.find_matches(self.record_pages(text_pages, pages), options)
         
+        return pages, matches, extraction_method
+    
+    def record_pages(self, pages: Iterable[Tuple[int, str]], recorded: List[Tuple[int, str]]) -> Iterator[Tuple[int, str]]:
+        """Pass pages through unchanged, appending each one to recorded"""
+        for page in pages:
+            recorded.append(page)
+            yield page
+    
+    def join_pages(self, pages: List[Tuple[int, str]]) -> Tuple[str, List[Tuple[int, int]]]:
+        """Join pages into one document text, returning it with each page's (start offset, page_num)"""
+        sections = []
+        page_starts = []
+        offset = 0
+        for page_num, page_text in pages:
+            section = f"\n--- Page {page_num} ---\n{page_text}"
+            page_starts.append((offset, page_num))
+            sections.append(section)
+            offset += len(section)
+        return ''.join(sections), page_starts
+    
+    def page_at_offset(self, position: int, page_starts: List[Tuple[int, int]]):
+        """Map an offset in the joined document text back to its page number"""
+        # Offset 0 is the first page header, which is what extractors report when
+        # they don't know where a value came from
+        if position <= 0 or not page_starts:
+            return 'Multiple'
+        index = bisect.bisect_right(page_starts, (position, float('inf'))) - 1
+        return page_starts[index][1]
+    
+    @contextmanager
+    def open_pdf(self, file_path: str):
+        """Open a PDF with pdfplumber, parsing it from a read-only memory map of the file"""
+        with open(file_path, 'rb') as pdf_file, \
+                mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_READ) as pdf_map:
+            # pdfminer seeks around the mapped pages directly; passing the path keeps
+            # page rendering on pdfium's own file access
+            with pdfplumber.PDF(pdf_map, stream_is_external=True, path=pathlib.Path(file_path)) as pdf:
+                yield pdf
+    
+    def select_strategy(self, pdf, file_path: str, options: Dict) -> str:
+        """Pick how to extract a document's text from its page count and file size"""
+        if options['force_ocr']:
+            return 'ocr'
+        if options['fast_text'] and pdfium is not None:
+            return 'fast'
+        
+        page_count = len(pdf.pages)
+        size_mb = os.path.getsize(file_path) / (1024 * 1024)
+        for max_pages, max_size_mb, strategy in EXTRACTION_STRATEGIES:
+            if page_count <= max_pages and (max_size_mb is None or size_mb <= max_size_mb):
+                return strategy
+        return 'process'
+    
+    def iter_page_texts(self, pdf, file_path: str, text_stats: Dict, strategy: str = 'sequential',
+                        prefetched: Optional[Future] = None) -> Iterator[Tuple[int, str]]:
+        """Yield (page_num, text) for every page, '' when it has no text, adding its character count to text_stats"""
+        if strategy == 'fast':
+            yield from self.iter_page_texts_fast(file_path, text_stats)
+            return
+        
+        if prefetched is not None:
+            page_stream = self.iter_prefetched_texts(pdf, prefetched)
+        elif strategy == 'process':
+            page_stream = self.iter_page_texts_parallel(file_path, len(pdf.pages), PROCESS_CHUNK_PAGES)
+        elif strategy == 'threaded':
+            # One range per thread after the OCR sample
+            remaining = max(len(pdf.pages) - OCR_SAMPLE_PAGES, 1)
+            chunk_pages = -(-remaining // TEXT_THREAD_WORKERS)
+            page_stream = self.iter_page_texts_parallel(file_path, len(pdf.pages), chunk_pages, use_threads=True)
+        else:
+            page_stream = self.iter_page_texts_plumber(pdf, close_pages=(strategy == 'streamed'))
+        
+        for page_num, page_text in page_stream:
+            text_stats['chars'] += len(page_text.strip())
+            yield page_num, page_text
+    
+    def iter_prefetched_texts(self, pdf, future: Future) -> Iterator[Tuple[int, str]]:
+        """Yield page text extracted ahead by a worker process, extracting it here if the worker failed"""
         try:
-            for page_num, page in enumerate(pdf.pages, 1):
+            pages = future.result()
+        except Exception as e:
+            self.logger.warning(f"Background text extraction failed, extracting directly: {str(e)}")
+            pages = self.iter_page_texts_plumber(pdf)
+        yield from pages
+    
+    def iter_page_texts_plumber(self, pdf, close_pages: bool = False) -> Iterator[Tuple[int, str]]:
+        """Yield page text from pdfplumber, optionally dropping each page's parsed objects once read"""
+        for page_num, page in enumerate(pdf.pages, 1):
+            page_text = page.extract_text() or ""
+            if close_pages:
+                # Keeps memory flat on long documents instead of caching every page's layout
+                page.close()
+            yield page_num, page_text
+    
+    def iter_page_texts_parallel(self, file_path: str, page_count: int, chunk_pages: int,
+                                 use_threads: bool = False) -> Iterator[Tuple[int, str]]:
+        """Yield page text extracted by worker processes (or threads), each parsing its own range of pages"""
+        # The first range covers just the OCR sample so the OCR decision isn't held up
+        # behind a full chunk; each worker reopens the file, as pdfminer objects
+        # can't be shared between threads or processes
+        bounds = [1] + list(range(OCR_SAMPLE_PAGES + 1, page_count + 1, chunk_pages)) + [page_count + 1]
+        ranges = [(first, last - 1) for first, last in zip(bounds, bounds[1:]) if first < last]
+        
+        if use_threads:
+            # pdfminer is mostly Python, but content stream decompression releases the GIL
+            executor = ThreadPoolExecutor(max_workers=TEXT_THREAD_WORKERS)
+        else:
+            # Spawned rather than forked, since this runs on a worker thread next to Tk
+            executor = ProcessPoolExecutor(max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context('spawn'))
+        try:
+            futures = [executor.submit(extract_page_range, file_path, first, last) for first, last in ranges]
+            for future in futures:
+                yield from future.result()
+        finally:
+            # Don't extract the remaining ranges if the caller stopped early (e.g. switched to OCR)
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def iter_page_texts_fast(self, file_path: str, text_stats: Dict) -> Iterator[Tuple[int, str]]:
+        """Yield page text from PDFium's native text layer"""
+        document = pdfium.PdfDocument(file_path)
+        try:
+            for page_index in range(len(document)):
+                page = document[page_index]
+                text_page = page.get_textpage()
                 try:
-                    # Update status for current page
-                    self.root.after(0, lambda p=page_num, total=len(pdf.pages): 
-                                   self.status_label.config(text=f"OCR processing {filename} - Page {p}/{total}"))
-                    
-                    # Convert page to image
-                    page_image = page.to_image(resolution=300)  # High resolution for better OCR
-                    pil_image = page_image.original
-                    
-                    # Perform OCR on the image
-                    ocr_text = pytesseract.image_to_string(pil_image, config='--psm 6')
-                    
-                    if ocr_text.strip():
-                        page_texts[page_num] = ocr_text
-                        self.logger.info(f"OCR extracted {len(ocr_text)} characters from page {page_num} of {filename}")
-                    else:
-                        page_texts[page_num] = ""
-                        self.logger.warning(f"No OCR text found on page {page_num} of {filename}")
-                        
-                except Exception as e:
-                    self.logger.error(f"OCR failed for page {page_num} of {filename}: {str(e)}")
-                    page_texts[page_num] = ""
+                    # count_chars() is read straight from the text layer, so the
+                    # OCR heuristic doesn't need to re-measure the extracted string
+                    text_stats['chars'] += text_page.count_chars()
+                    page_text = text_page.get_text_range().replace('\r\n', '\n')
+                finally:
+                    text_page.close()
+                    page.close()
+                
+                yield page_index + 1, page_text if page_text.strip() else ""
+        finally:
+            document.close()
+    
+    def extract_text_with_ocr(self, pdf, filename: str, file_path: Optional[str] = None,
+                              text_layer_pages: Optional[Iterable[Tuple[int, str]]] = None) -> Dict[int, str]:
+        """Extract text from PDF using OCR, processing pages concurrently
+        
+        Pages in text_layer_pages (already extracted (page_num, text)) that have embedded
+        text keep it and are not OCR'd.
+        """
+        page_texts = {}
+        text_layer = {}
+        ocr_pages = list(enumerate(pdf.pages, 1))
+        total_pages = len(ocr_pages)
+        self._ocr_pages_done = 0
+        fitz_doc = None
+        
+        try:
+            if text_layer_pages is not None:
+                # Mixed documents only need the scanned pages OCR'd
+                text_layer = {page_num: page_text for page_num, page_text in text_layer_pages
+                              if len(page_text.strip()) >= TEXT_LAYER_MIN_CHARS}
+                ocr_pages = [(page_num, page) for page_num, page in ocr_pages if page_num not in text_layer]
+                if text_layer:
+                    self.logger.info(f"Keeping the text layer of {len(text_layer)} of {total_pages} pages in {filename}")
+                    self.report_ocr_progress(filename, total_pages, len(text_layer))
+            
+            if fitz is not None and file_path:
+                fitz_doc = fitz.open(file_path)
+            
+            with ThreadPoolExecutor(max_workers=OCR_WORKERS) as executor:
+                if tesserocr is not None:
+                    page_texts = dict(executor.map(
+                        lambda numbered: self._ocr_one_page(numbered[0], numbered[1], filename, total_pages, fitz_doc),
+                        ocr_pages))
+                elif ocr_pages:
+                    with tempfile.TemporaryDirectory(prefix='pdf_extractor_ocr_') as temp_dir:
+                        page_texts = self._ocr_pages_batched(executor, ocr_pages, total_pages, filename,
+                                                             fitz_doc, temp_dir)
                     
         except Exception as e:
             self.logger.error(f"OCR processing failed for {filename}: {str(e)}")
             # Return empty dict if OCR completely fails
             return {}
+        finally:
+            if fitz_doc is not None:
+                fitz_doc.close()
         
+        self.ocr_cache.prune()
+        page_texts = {page_num: postprocess_ocr_text(text) for page_num, text in page_texts.items()}
+        page_texts.update(text_layer)
         return page_texts
     
-    def find_matches(self, text: str, search_term: str, page_texts: Dict) -> List[Dict]:
-        """Find all matches for a search term in the text"""
-        matches = []
+    def _ocr_one_page(self, page_num: int, page, filename: str, total_pages: int, fitz_doc=None) -> Tuple[int, str]:
+        """OCR a single page, returning (page_num, text)"""
+        try:
+            ocr_text = self.ocr_page_image(page, page_num, fitz_doc, OCR_DRAFT_DPI, OCR_MIN_CONFIDENCE)
+            if not ocr_text.strip():
+                # Nothing read confidently at draft resolution, so read the page again at full resolution
+                ocr_text = self.ocr_page_image(page, page_num, fitz_doc, OCR_DPI)
+            ocr_text = self.log_ocr_result(ocr_text, page_num, filename)
+        except Exception as e:
+            self.logger.error(f"OCR failed for page {page_num} of {filename}: {str(e)}")
+            ocr_text = ""
+        
+        self.report_ocr_progress(filename, total_pages)
+        return page_num, ocr_text
+    
+    def ocr_page_image(self, page, page_num: int, fitz_doc, dpi: int, min_confidence: Optional[float] = None) -> str:
+        """Render a page at dpi and OCR it, freeing the image as soon as tesseract is done with it"""
+        pil_image, psm, variables = self.render_ocr_image(page, page_num, fitz_doc, dpi)
+        try:
+            return self._ocr_cached(pil_image, psm, variables, min_confidence=min_confidence)
+        finally:
+            # Every OCR worker holds a page image, so don't leave them for the garbage collector
+            pil_image.close()
+    
+    def _ocr_pages_batched(self, executor, pages: List[Tuple[int, object]], total_pages: int, filename: str,
+                           fitz_doc, temp_dir: str) -> Dict[int, str]:
+        """Render (page_num, page) pairs to PNGs in temp_dir, then OCR them with one tesseract run per batch of pages"""
+        page_texts = {}
+        remaining = pages
+        
+        # Pages tesseract isn't confident about at draft resolution go round again at full resolution
+        for dpi, min_confidence in ((OCR_DRAFT_DPI, OCR_MIN_CONFIDENCE), (OCR_DPI, None)):
+            round_texts = self._ocr_batched_round(executor, remaining, filename, total_pages, fitz_doc,
+                                                  temp_dir, dpi, min_confidence)
+            for page_num, ocr_text in round_texts.items():
+                if ocr_text.strip() or min_confidence is None:
+                    page_texts[page_num] = self.log_ocr_result(ocr_text, page_num, filename)
+            
+            remaining = [(page_num, page) for page_num, page in remaining if page_num not in page_texts]
+            if not remaining:
+                break
+        
+        return page_texts
+    
+    def _ocr_batched_round(self, executor, pages: List[Tuple[int, object]], filename: str, total_pages: int,
+                           fitz_doc, temp_dir: str, dpi: int, min_confidence: Optional[float]) -> Dict[int, str]:
+        """OCR (page_num, page) pairs rendered at dpi, blanking pages read with less than min_confidence"""
+        page_texts = {}
+        pending = []  # (page_num, image_path, cache_key, config) still to OCR
+        
+        def report_done(texts: Iterable[str]):
+            # Pages left blank in a draft round are retried, so they aren't finished yet
+            self.report_ocr_progress(filename, total_pages,
+                                     sum(1 for text in texts if min_confidence is None or text.strip()))
+        
+        # Rendering is serialized by the render lock, but hashing, cache lookups and PNG encoding overlap
+        prepared = executor.map(
+            lambda numbered: self._prepare_batch_page(numbered[0], numbered[1], filename, fitz_doc, temp_dir, dpi),
+            pages)
+        for page_num, cached_text, image_path, key, config in prepared:
+            if image_path is None:
+                page_texts[page_num] = cached_text
+            else:
+                pending.append((page_num, image_path, key, config))
+        report_done(page_texts.values())
+        
+        # Spread the pages over the workers, each tesseract process starting up once per batch
+        batch_size = max(1, min(OCR_BATCH_PAGES, -(-len(pending) // OCR_WORKERS)))
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        for batch, texts in zip(batches, executor.map(lambda batch: self._ocr_batch(batch, filename, min_confidence),
+                                                      batches)):
+            for (page_num, _, key, _), ocr_text in zip(batch, texts):
+                self.ocr_cache.put(key, ocr_text)
+                page_texts[page_num] = ocr_text
+            report_done(texts)
+        
+        return page_texts
+    
+    def _prepare_batch_page(self, page_num: int, page, filename: str, fitz_doc, temp_dir: str,
+                            dpi: int) -> Tuple[int, Optional[str], Optional[str], Optional[Tuple], str]:
+        """Return (page_num, text, None, ...) for a cached page, else (page_num, None, png_path, cache_key, config)"""
+        try:
+            pil_image, psm, variables = self.render_ocr_image(page, page_num, fitz_doc, dpi)
+            try:
+                key, config = self.ocr_cache_key(pil_image, psm, variables)
+                
+                cached_text = self.ocr_cache.get(key)
+                if cached_text is not None:
+                    return page_num, cached_text, None, None, config
+                
+                image_path = os.path.join(temp_dir, f"page_{page_num:05d}_{dpi}.png")
+                pil_image.save(image_path)
+                return page_num, None, image_path, key, config
+            finally:
+                # The batch reads the page back from the PNG, so the pixels can go now
+                pil_image.close()
+        except Exception as e:
+            self.logger.error(f"OCR failed for page {page_num} of {filename}: {str(e)}")
+            return page_num, "", None, None, ""
+    
+    def _ocr_batch(self, batch: List[Tuple], filename: str, min_confidence: Optional[float] = None) -> List[str]:
+        """OCR a batch of page images with a single tesseract run, returning one text per page"""
+        config = batch[0][3]
+        list_path = os.path.splitext(batch[0][1])[0] + "_list.txt"
+        try:
+            with open(list_path, 'w') as list_file:
+                list_file.write(''.join(f"{image_path}\n" for _, image_path, _, _ in batch))
+            
+            if min_confidence is not None:
+                # The TSV output numbers each image in the list as a page
+                data = pytesseract.image_to_data(list_path, lang='eng', config=config,
+                                                 output_type=pytesseract.Output.DICT)
+                by_page = self.parse_ocr_data(data)
+                return [self.confident_text(*by_page.get(index, ("", 0.0)), min_confidence)
+                        for index in range(1, len(batch) + 1)]
+            
+            # Tesseract ends every page's text with a form feed
+            texts = pytesseract.image_to_string(list_path, lang='eng', config=config).split('\f')
+            if len(texts) >= len(batch) and not ''.join(texts[len(batch):]).strip():
+                return texts[:len(batch)]
+            self.logger.warning(f"Batch OCR of {filename} returned {len(texts)} pages for {len(batch)} images; "
+                                f"retrying them one at a time")
+        except Exception as e:
+            self.logger.error(f"Batch OCR failed for {filename}: {str(e)}")
+        
+        texts = []
+        for page_num, image_path, _, _ in batch:
+            try:
+                if min_confidence is not None:
+                    data = pytesseract.image_to_data(image_path, lang='eng', config=config,
+                                                     output_type=pytesseract.Output.DICT)
+                    texts.append(self.confident_text(*self.parse_ocr_data(data).get(1, ("", 0.0)), min_confidence))
+                else:
+                    texts.append(pytesseract.image_to_string(image_path, lang='eng', config=config))
+            except Exception as e:
+                self.logger.error(f"OCR failed for page {page_num} of {filename}: {str(e)}")
+                texts.append("")
+        return texts
+    
+    def parse_ocr_data(self, data: Dict[str, List]) -> Dict[int, Tuple[str, float]]:
+        """Rebuild page text from tesseract TSV data, returning {page_num: (text, mean word confidence)}"""
+        pages = {}
+        rows = zip(data.get('page_num', []), data.get('block_num', []), data.get('par_num', []),
+                   data.get('line_num', []), data.get('conf', []), data.get('text', []))
+        for page_num, block_num, par_num, line_num, conf, word in rows:
+            # Page, block, paragraph and line rows carry a confidence of -1
+            if float(conf) < 0 or not str(word).strip():
+                continue
+            lines, confidences = pages.setdefault(int(page_num), ({}, []))
+            lines.setdefault((block_num, par_num, line_num), []).append(str(word))
+            confidences.append(float(conf))
+        
+        page_data = {}
+        for page_num, (lines, confidences) in pages.items():
+            # Lines end with a newline and paragraphs are separated by a blank line, as in tesseract's text output
+            parts = []
+            previous_paragraph = None
+            for (block_num, par_num, _), words in lines.items():
+                if previous_paragraph is not None and previous_paragraph != (block_num, par_num):
+                    parts.append("\n")
+                parts.append(" ".join(words) + "\n")
+                previous_paragraph = (block_num, par_num)
+            page_data[page_num] = ("".join(parts), sum(confidences) / len(confidences))
+        
+        return page_data
+    
+    def confident_text(self, ocr_text: str, confidence: float, min_confidence: float) -> str:
+        """Return the OCR text, or '' when tesseract's confidence in it is below min_confidence"""
+        return ocr_text if confidence >= min_confidence else ""
+    
+    def render_ocr_image(self, page, page_num: int, fitz_doc=None, dpi: int = OCR_DPI) -> Tuple:
+        """Render a page for OCR, returning (image, psm, tesseract variables)"""
+        # Neither pdfium nor MuPDF is thread-safe, so rendering is serialized
+        # and only the OCR itself runs in parallel.
+        with self._render_lock:
+            if fitz_doc is not None:
+                pil_image = self.render_page_fitz(fitz_doc, page_num, dpi)
+            else:
+                pil_image = page.to_image(resolution=dpi).original
         
+        if cv2 is not None:
+            # Already binarized, so tesseract can skip its own preprocessing
+            return self.binarize_image(pil_image), 6, {'tessedit_do_invert': '0'}
+        # Tesseract works on grayscale anyway, and it's a third of the pixel data to hash and encode
+        return pil_image.convert("L"), 6, {}
+    
+    def log_ocr_result(self, ocr_text: str, page_num: int, filename: str) -> str:
+        """Log how much text OCR found on a page, normalizing blank results to ''"""
+        if ocr_text.strip():
+            self.logger.info(f"OCR extracted {len(ocr_text)} characters from page {page_num} of {filename}")
+            return ocr_text
+        self.logger.warning(f"No OCR text found on page {page_num} of {filename}")
+        return ""
+    
+    def report_ocr_progress(self, filename: str, total_pages: int, pages_done: int = 1):
+        """Update status with the number of pages finished so far"""
+        with self._ocr_progress_lock:
+            self._ocr_pages_done += pages_done
+            done = self._ocr_pages_done
+        self.ui_queue.put(("status", f"OCR processing {filename} - Page {done}/{total_pages}"))
+    
+    def render_page_fitz(self, fitz_doc, page_num: int, dpi: int = OCR_DPI):
+        """Rasterize a page with MuPDF straight into a PIL image"""
+        pixmap = fitz_doc.load_page(page_num - 1).get_pixmap(dpi=dpi)
+        return Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+    
+    def binarize_image(self, pil_image):
+        """Convert a page image to black and white with Otsu thresholding"""
+        gray = np.asarray(pil_image.convert("L"))
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        return Image.fromarray(binary)
+    
+    def ocr_cache_key(self, pil_image, psm: int, variables: Dict[str, str], lang: str = 'eng') -> Tuple[Tuple, str]:
+        """Return the OCR cache key for an image and the matching tesseract config string"""
+        config = f"--psm {psm}" + ''.join(f" -c {name}={value}" for name, value in variables.items())
+        version = tesserocr.tesseract_version() if tesserocr is not None else self.tesseract_version
+        return (OCRCache.image_hash(pil_image), version, lang, config), config
+    
+    def _ocr_cached(self, pil_image, psm: int, variables: Optional[Dict[str, str]] = None, lang: str = 'eng',
+                    min_confidence: Optional[float] = None) -> str:
+        """Run tesseract on an image, reusing the stored result for a page seen before
+        
+        With min_confidence, text read with a lower mean word confidence is returned (and cached) as ''.
+        """
+        variables = variables or {}
+        key, config = self.ocr_cache_key(pil_image, psm, variables, lang)
+        
+        cached_text = self.ocr_cache.get(key)
+        if cached_text is not None:
+            return cached_text
+        
+        if tesserocr is not None:
+            ocr_text, confidence = self._ocr_in_process(pil_image, psm, variables, lang)
+        elif min_confidence is not None:
+            data = pytesseract.image_to_data(pil_image, lang=lang, config=config, output_type=pytesseract.Output.DICT)
+            ocr_text, confidence = self.parse_ocr_data(data).get(1, ("", 0.0))
+        else:
+            ocr_text, confidence = pytesseract.image_to_string(pil_image, lang=lang, config=config), None
+        
+        if min_confidence is not None:
+            ocr_text = self.confident_text(ocr_text, confidence, min_confidence)
+        self.ocr_cache.put(key, ocr_text)
+        return ocr_text
+    
+    def _ocr_in_process(self, pil_image, psm: int, variables: Dict[str, str], lang: str) -> Tuple[str, float]:
+        """OCR an image on a pooled tesserocr instance, each used by one thread at a time
+        
+        Returns the text and tesseract's mean word confidence for it.
+        """
         try:
+            api = self._tess_apis.get_nowait()
+        except queue.Empty:
+            # In the bundle, TESSDATA_PREFIX points at the bundled tessdata
+            tessdata_path = os.environ.get('TESSDATA_PREFIX')
+            if tessdata_path:
+                api = tesserocr.PyTessBaseAPI(path=tessdata_path, lang=lang)
+            else:
+                api = tesserocr.PyTessBaseAPI(lang=lang)
+        
+        try:
+            api.SetPageSegMode(psm)
+            for name, value in variables.items():
+                api.SetVariable(name, value)
+            api.SetImage(pil_image)
+            ocr_text = api.GetUTF8Text()
+            confidence = api.MeanTextConf()
+        except Exception:
+            api.End()
+            raise
+        
+        self._tess_apis.put(api)
+        return ocr_text, confidence
+    
+    def compile_search_terms(self, search_terms: List[str], options: Dict) -> Dict:
+        """Compile all search terms once per run so each page can be scanned in a single pass"""
+        case_sensitive = options['case_sensitive']
+        regex_mode = options['regex']
+        flags = 0 if case_sensitive else re.IGNORECASE
+        
+        matcher = {
+            'terms': [],
+            'compiled': [],
+            'fallback_terms': [],  # Invalid regexes, searched as plain strings
+            'combined': None,
+            'hs_db': None
+        }
+        patterns = []
+        
+        for search_term in search_terms:
             # Prepare search pattern
-            if self.regex_var.get():
+            if regex_mode:
                 pattern = search_term
             else:
                 # Escape regex special characters
                 pattern = re.escape(search_term)
-                if self.whole_words_var.get():
+                if options['whole_words']:
                     pattern = r'\b' + pattern + r'\b'
             
-            # Set case sensitivity
-            flags = 0 if self.case_sensitive_var.get() else re.IGNORECASE
+            try:
+                compiled_pattern = re.compile(pattern, flags)
+            except re.error as e:
+                self.logger.error(f"Regex error for pattern '{search_term}': {str(e)}")
+                matcher['fallback_terms'].append(search_term)
+                continue
             
-            # Search in each page
-            for page_num, page_text in page_texts.items():
-                for match in re.finditer(pattern, page_text, flags):
-                    match_text = match.group()
-                    start_pos = match.start()
-                    end_pos = match.end()
-                    
-                    # Get context if requested
-                    context = ""
-                    if self.context_var.get():
-                        context_length = int(self.context_length.get() or 100)
-                        context_start = max(0, start_pos - context_length)
-                        context_end = min(len(page_text), end_pos + context_length)
-                        context = page_text[context_start:context_end]
-                        # Clean up context
-                        context = ' '.join(context.split())
+            matcher['terms'].append(search_term)
+            matcher['compiled'].append(compiled_pattern)
+            patterns.append(pattern)
+        
+        # User regexes can contain numbered groups and backreferences that an
+        # alternation would renumber, so only escaped literal terms are combined
+        if patterns and not regex_mode:
+            matcher['combined'] = re.compile('|'.join(f"(?:{pattern})" for pattern in patterns), flags)
+            
+            if hyperscan is not None:
+                try:
+                    hs_flags = hyperscan.HS_FLAG_SOM_LEFTMOST
+                    if not case_sensitive:
+                        hs_flags |= hyperscan.HS_FLAG_CASELESS
                     
-                    matches.append({
-                        'page': page_num,
-                        'match': match_text,
-                        'context': context,
-                        'position': start_pos
-                    })
-        
-        except re.error as e:
-            self.logger.error(f"Regex error for pattern '{search_term}': {str(e)}")
-            # Fallback to simple string search
-            if search_term in text:
-                matches.append({
-                    'page': 'Unknown',
-                    'match': search_term,
-                    'context': '',
-                    'position': 0
-                })
+                    database = hyperscan.Database()
+                    database.compile(expressions=[pattern.encode('utf-8') for pattern in patterns],
+                                     ids=list(range(len(patterns))), elements=len(patterns),
+                                     flags=hs_flags)
+                    matcher['hs_db'] = database
+                except Exception as e:
+                    self.logger.warning(f"Hyperscan unavailable for these terms, using re: {str(e)}")
+        
+        return matcher
+    
+    def find_matches(self, pages: Iterable[Tuple[int, str]], options: Dict) -> List[Tuple]:
+        """Find all matches for every compiled search term, consuming (page_num, text) pairs as they arrive
+        
+        Returns (search_term, page, match_text, context, position) tuples; the caller builds the result dicts.
+        """
+        matcher = self.search_matcher
+        terms = matcher['terms']
+        # Results are grouped by search term, as when each term was searched separately
+        found_by_term = [[] for _ in terms]
+        fallback_found = set()
+        
+        context_length = options['context_length'] if options['include_context'] else None
+        
+        # Search in each page
+        for page_num, page_text in pages:
+            for search_term in matcher['fallback_terms']:
+                if search_term not in fallback_found and search_term in page_text:
+                    fallback_found.add(search_term)
+            
+            spans = self.scan_page(page_text, matcher)
+            if context_length is None:
+                for term_index, start_pos, end_pos in spans:
+                    found_by_term[term_index].append(
+                        (terms[term_index], page_num, page_text[start_pos:end_pos], "", start_pos))
+            else:
+                for term_index, start_pos, end_pos in spans:
+                    # Clean up context
+                    context = ' '.join(page_text[max(0, start_pos - context_length):end_pos + context_length].split())
+                    found_by_term[term_index].append(
+                        (terms[term_index], page_num, page_text[start_pos:end_pos], context, start_pos))
+        
+        matches = [match for term_matches in found_by_term for match in term_matches]
+        
+        # Fallback to simple string search for terms that are not valid regexes
+        for search_term in matcher['fallback_terms']:
+            if search_term in fallback_found:
+                matches.append((search_term, 'Unknown', search_term, '', 0))
         
         return matches
     
+    def scan_page(self, page_text: str, matcher: Dict) -> List[Tuple[int, int, int]]:
+        """Return (term_index, start, end) for every non-overlapping match of each term on a page"""
+        # Hyperscan works on bytes with ASCII case folding, so it only handles ASCII pages
+        if matcher['hs_db'] is not None and page_text.isascii():
+            hits = []
+            matcher['hs_db'].scan(page_text.encode('ascii'),
+                                  match_event_handler=lambda term_index, start, end, flags, context:
+                                  hits.append((start, term_index, end)))
+            hits.sort()
+            return self.select_non_overlapping(hits)
+        
+        if matcher['combined'] is not None:
+            candidates = []
+            search = matcher['combined'].search
+            match = search(page_text)
+            while match:
+                start = match.start()
+                # The alternation only reports the first term that matches here, so
+                # check every term at this position to keep overlapping terms
+                for term_index, compiled_pattern in enumerate(matcher['compiled']):
+                    term_match = compiled_pattern.match(page_text, start)
+                    if term_match:
+                        candidates.append((start, term_index, term_match.end()))
+                match = search(page_text, start + 1)
+            return self.select_non_overlapping(candidates)
+        
+        # Regex mode - each precompiled term scans the page on its own
+        spans = []
+        for term_index, compiled_pattern in enumerate(matcher['compiled']):
+            for match in compiled_pattern.finditer(page_text):
+                spans.append((term_index, match.start(), match.end()))
+        return spans
+    
+    def select_non_overlapping(self, hits: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+        """Keep each term's leftmost non-overlapping hits from (start, term_index, end) sorted by start"""
+        spans = []
+        term_ends = {}
+        for start, term_index, end in hits:
+            if start >= term_ends.get(term_index, 0):
+                spans.append((term_index, start, end))
+                term_ends[term_index] = end
+        return spans
+    
     def processing_complete(self):
         """Called when processing is complete"""
         self.is_processing = False
@@ -748,24 +1770,17 @@ Body type"""
         self.results_text.delete(1.0, tk.END)
         
         # Group results by file and search term
-        by_file = {}
+        by_file = defaultdict(lambda: defaultdict(list))
         for result in self.extracted_data:
-            filename = result['filename']
-            if filename not in by_file:
-                by_file[filename] = {}
-            
-            term = result['search_term']
-            if term not in by_file[filename]:
-                by_file[filename][term] = []
-            
-            by_file[filename][term].append(result)
+            by_file[result['filename']][result['search_term']].append(result)
         
-        # Display grouped results
+        # Build the whole text first; one insert lays the widget out once instead of per line
+        parts = []
         for filename, terms_data in by_file.items():
-            self.results_text.insert(tk.END, f"\n=== {filename} ===\n")
+            parts.append(f"\n=== {filename} ===\n")
             
             for term, matches in terms_data.items():
-                self.results_text.insert(tk.END, f"\n  Search term: '{term}' ({len(matches)} matches)\n")
+                parts.append(f"\n  Search term: '{term}' ({len(matches)} matches)\n")
                 
                 for i, match in enumerate(matches, 1):
                     page = match.get('page', 'Unknown')
@@ -774,23 +1789,25 @@ Body type"""
                     extraction_method = match.get('extraction_method', 'Normal')
                     
                     method_indicator = " [OCR]" if extraction_method == "OCR" else ""
-                    self.results_text.insert(tk.END, f"    {i}. Page {page}{method_indicator}: {match_text}\n")
+                    parts.append(f"    {i}. Page {page}{method_indicator}: {match_text}\n")
                     
                     if context and len(context) > len(match_text):
                         # Show context with match highlighted
-                        self.results_text.insert(tk.END, f"       Context: ...{context}...\n")
+                        parts.append(f"       Context: ...{context}...\n")
                     
-                    self.results_text.insert(tk.END, "\n")
+                    parts.append("\n")
         
         # Summary
         total_matches = len(self.extracted_data)
         unique_files = len(set(result['filename'] for result in self.extracted_data))
         unique_terms = len(set(result['search_term'] for result in self.extracted_data))
         
-        self.results_text.insert(tk.END, f"\n=== SUMMARY ===\n")
-        self.results_text.insert(tk.END, f"Total matches: {total_matches}\n")
-        self.results_text.insert(tk.END, f"Files with matches: {unique_files}\n")
-        self.results_text.insert(tk.END, f"Search terms found: {unique_terms}\n")
+        parts.append(f"\n=== SUMMARY ===\n")
+        parts.append(f"Total matches: {total_matches}\n")
+        parts.append(f"Files with matches: {unique_files}\n")
+        parts.append(f"Search terms found: {unique_terms}\n")
+        
+        self.results_text.insert(tk.END, "".join(parts))
     
     def export_to_excel(self):
         """Export extracted data to Excel file"""
@@ -857,8 +1874,10 @@ Body type"""
         by_file = {}
         for result in self.extracted_data:
             file_key = result['filename']
-            if file_key not in by_file:
-                by_file[file_key] = {
+            file_data = by_file.get(file_key)
+            if file_data is None:
+                # The first result for a file supplies its extraction method
+                file_data = by_file[file_key] = {
                     'filename': file_key,
                     'extraction_method': result.get('extraction_method', 'Normal'),
                     'insurance_data': {}
@@ -867,7 +1886,7 @@ Body type"""
             # Add insurance field data
             if 'insurance_field' in result:
                 field_key = result['insurance_field']
-                by_file[file_key]['insurance_data'][field_key] = {
+                file_data['insurance_data'][field_key] = {
                     'field_name': result['search_term'],
                     'value': result.get('match', result.get('context', 'Found')),
                     'found': True
@@ -889,54 +1908,24 @@ Body type"""
     def export_normal_data(self, filename: str):
         """Export normal search data using the standard format"""
         try:
-            # Create DataFrame
-            df = pd.DataFrame(self.extracted_data)
-            
-            # Create Excel file with formatting
-            with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='Extracted Data', index=False)
-                
-                # Get workbook and worksheet
-                workbook = writer.book
-                worksheet = writer.sheets['Extracted Data']
-                
-                # Format headers
-                header_font = Font(bold=True, color="FFFFFF")
-                header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+            # Rows are streamed to disk as they are written, so memory stays flat for large result sets
+            workbook = xlsxwriter.Workbook(filename, {
+                'constant_memory': True, 'strings_to_urls': False, 'strings_to_formulas': False
+            })
+            try:
+                header_format = workbook.add_format({
+                    'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#366092', 'align': 'center'
+                })
                 
-                for cell in worksheet[1]:  # First row (headers)
-                    cell.font = header_font
-                    cell.fill = header_fill
-                    cell.alignment = Alignment(horizontal='center')
-                
-                # Auto-adjust column widths
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    
-                    for cell in column:
-                        try:
-                            cell_length = len(str(cell.value))
-                            if cell_length > max_length:
-                                max_length = cell_length
-                        except:
-                            pass
-                    
-                    # Set width with some padding, but cap it
-                    adjusted_width = min(max_length + 2, 50)
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
+                # Columns in first-seen order across all results
+                columns = list(dict.fromkeys(key for result in self.extracted_data for key in result))
+                self.write_sheet(workbook, 'Extracted Data', columns, self.extracted_data, header_format)
                 
                 # Add summary sheet
-                summary_data = self.create_summary_data()
-                summary_df = pd.DataFrame(summary_data)
-                summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                
-                # Format summary sheet
-                summary_sheet = writer.sheets['Summary']
-                for cell in summary_sheet[1]:
-                    cell.font = header_font
-                    cell.fill = header_fill
-                    cell.alignment = Alignment(horizontal='center')
+                self.write_sheet(workbook, 'Summary', ['Type', 'Name', 'Matches'],
+                                 self.create_summary_data(), header_format)
+            finally:
+                workbook.close()
             
             messagebox.showinfo("Success", f"Data exported successfully to:\n{filename}")
             self.status_label.config(text=f"Data exported to Excel: {os.path.basename(filename)}")
@@ -945,37 +1934,37 @@ Body type"""
             self.logger.error(f"Export error: {str(e)}")
             messagebox.showerror("Error", f"Failed to export data:\n{str(e)}")
     
+    def write_sheet(self, workbook, sheet_name: str, columns: List[str], rows: List[Dict], header_format):
+        """Write a header row and one row per dict, sizing columns to their longest value"""
+        # pandas takes a while to import and is only needed for exports, so it isn't loaded at startup
+        import pandas as pd
+        
+        worksheet = workbook.add_worksheet(sheet_name)
+        
+        # Column widths have to be known before rows are flushed in constant memory mode
+        lengths = pd.DataFrame(rows, columns=columns).fillna('').astype(str)
+        for col, column in enumerate(columns):
+            max_length = max(len(str(column)), int(lengths[column].str.len().max()) if len(lengths) else 0)
+            # Set width with some padding, but cap it
+            worksheet.set_column(col, col, min(max_length + 2, 50))
+        
+        worksheet.write_row(0, 0, columns, header_format)
+        for row_num, row in enumerate(rows, 1):
+            worksheet.write_row(row_num, 0, [row.get(column) for column in columns])
+    
     def create_summary_data(self) -> List[Dict]:
         """Create summary data for the Excel export"""
-        summary = []
+        import pandas as pd
         
-        # Count by file
-        file_counts = {}
-        for result in self.extracted_data:
-            filename = result['filename']
-            file_counts[filename] = file_counts.get(filename, 0) + 1
-        
-        for filename, count in file_counts.items():
-            summary.append({
-                'Type': 'File',
-                'Name': filename,
-                'Matches': count
-            })
+        df = pd.DataFrame(self.extracted_data, columns=['filename', 'search_term'])
         
-        # Count by search term
-        term_counts = {}
-        for result in self.extracted_data:
-            term = result['search_term']
-            term_counts[term] = term_counts.get(term, 0) + 1
-        
-        for term, count in term_counts.items():
-            summary.append({
-                'Type': 'Search Term',
-                'Name': term,
-                'Matches': count
-            })
+        # Count by file, then by search term, in first-seen order
+        summary = []
+        for type_name, column in (('File', 'filename'), ('Search Term', 'search_term')):
+            counts = df.groupby(column, sort=False).size()
+            summary.append(pd.DataFrame({'Type': type_name, 'Name': counts.index, 'Matches': counts.values}))
         
-        return summary
+        return pd.concat(summary, ignore_index=True).to_dict('records')
     
     def reset_ui(self):
         """Reset UI elements after processing"""
@@ -1004,24 +1993,18 @@ Body type"""
                 }
                 df_data.append(row)
             
-            df = pd.DataFrame(df_data)
-            
             # Create Excel with formatting
-            with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='IDP Extraction Results', index=False)
-                
-                # Format the sheet
-                from openpyxl.styles import Font, PatternFill, Alignment
-                ws = writer.sheets['IDP Extraction Results']
-                
-                # Header formatting
-                header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                header_font = Font(color="FFFFFF", bold=True)
-                
-                for cell in ws[1]:
-                    cell.fill = header_fill
-                    cell.font = header_font
-                    cell.alignment = Alignment(horizontal="center")
+            workbook = xlsxwriter.Workbook(filename, {
+                'constant_memory': True, 'strings_to_urls': False, 'strings_to_formulas': False
+            })
+            try:
+                header_format = workbook.add_format({
+                    'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#366092', 'align': 'center'
+                })
+                columns = list(df_data[0]) if df_data else []
+                self.write_sheet(workbook, 'IDP Extraction Results', columns, df_data, header_format)
+            finally:
+                workbook.close()
             
             messagebox.showinfo("Success", f"IDP data exported (fallback mode) to:\n{filename}")
             self.status_label.config(text=f"IDP data exported (fallback): {os.path.basename(filename)}")
@@ -1032,6 +2015,9 @@ Body type"""
 
 def main():
     """Main application entry point"""
+    # Needed for the text extraction worker processes in the bundled app
+    multiprocessing.freeze_support()
+    
     root = tk.Tk()
     
     # Set app icon and style
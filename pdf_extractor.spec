@@ -27,6 +27,7 @@ a = Analysis(
     hiddenimports=[
         'pdfplumber',
         'openpyxl', 
+        'xlsxwriter',
         'pandas',
         'pytesseract',
         'PIL',
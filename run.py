@@ -24,6 +24,7 @@ def check_and_install_dependencies():
     required_packages = {
         'pdfplumber': 'pdfplumber==0.11.0',
         'openpyxl': 'openpyxl==3.1.2', 
+        'xlsxwriter': 'xlsxwriter==3.2.0',
         'pandas': 'pandas==2.2.2',
         'tkinter': None  # Built-in, just check
     }
@@ -8,208 +8,570 @@ import os
 import sys
 import pdfplumber
 import pytesseract
-import pandas as pd
+import xlsxwriter
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Iterator, Set
 import logging
+import queue
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+# Optional in-process tesseract binding; without it pytesseract runs the tesseract binary
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+# Optional poppler renderer; without it pages are rendered by pdfplumber, one at a time
+try:
+    from pdf2image import convert_from_path
+except ImportError:
+    convert_from_path = None
+
+# PDFium (installed with pdfplumber) reads a page's text layer without building
+# pdfplumber's per-character objects; used only with fast_text, as its text follows
+# content-stream order rather than pdfplumber's layout
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+# Optional multi-pattern scanner; without it each pattern is searched with re
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Hyperscan's \s leaves out the ASCII separator characters that Python's \s includes
+HS_SEPARATORS_TO_SPACE = bytes.maketrans(b'\x1c\x1d\x1e\x1f', b'    ')
+
+# Optional on-disk cache of page texts, safe to share between the worker processes;
+# without it every run reads and OCRs the PDFs again
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+# Page texts are kept here between runs, keyed by the PDF's path, modification time and size
+TEXT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'pdes')
+
+# Value recorded for every field of a PDF whose extraction failed outright
+EXTRACTION_ERROR = 'Error'
+
+# Pages per tesseract run; tesseract can hang on very long image lists
+OCR_BATCH_PAGES = 100
+
+# Pages with at least this much embedded text are taken as is instead of being OCR'd
+TEXT_LAYER_MIN_CHARS = 50
+
+# Pages read (and OCR'd when needed) together before checking which fields are still missing
+PAGE_WINDOW = 8
+
+# Policy documents are laid out as forms: the LSTM engine alone, reading each page as one
+# block of text, is faster than automatic page segmentation and keeps label/value pairs together
+OCR_ENGINE_MODE = 1
+OCR_PAGE_SEG_MODE = 6
+OCR_VARIABLES = {'preserve_interword_spaces': '1'}
+OCR_CONFIG = (f"--oem {OCR_ENGINE_MODE} --psm {OCR_PAGE_SEG_MODE}"
+              + ''.join(f" -c {name}={value}" for name, value in OCR_VARIABLES.items()))
+
+# Pages that OCR to fewer characters than this at the default resolution are redone at OCR_RETRY_DPI
+OCR_RETRY_MIN_CHARS = 100
+OCR_RETRY_DPI = 300
+
+# Value fragments shared by several fields' patterns; group 1 is the value
+AMOUNT_PATTERN = r'(?:rs\.?)?\s*([0-9,]+(?:\.[0-9]{2})?)'
+DATE_PATTERN = r'([0-9]{1,2}[\/\-\.][0-9]{1,2}[\/\-\.][0-9]{2,4})'
+
+
+# The 15 required fields with simple patterns; every match of a field's
+# patterns contains one of its (lowercase) anchors
+INSURANCE_FIELDS = {
+    'policy_no': {
+        'name': 'Policy no.',
+        'anchors': ['policy', 'certificate'],
+        'patterns': [
+            r'(?:policy|certificate)\s*(?:no|number)\.?\s*:?\s*([A-Z0-9\-/]{4,})',
+            r'policy\s*:?\s*([A-Z0-9\-/]{6,})',
+        ]
+    },
+    'insured_name': {
+        'name': 'Insured name',
+        'anchors': ['insured', 'mr', 'ms', 'dr', 'm/s'],
+        'patterns': [
+            r'insured\s*(?:name)?\s*:?\s*([A-Za-z\s\.\,]{3,50})',
+            r'(?:mr|mrs|ms|dr|m/s)\.?\s+([A-Za-z\s\.\,]{3,50})',
+        ]
+    },
+    'insurer_name': {
+        'name': 'Insurer name',
+        'anchors': ['insur'],
+        'patterns': [
+            r'(?:insurer|insurance\s*company)\s*:?\s*([A-Za-z\s&\.\,\-]{5,})',
+            r'([A-Za-z\s&\.\-]{5,})\s*insurance',
+        ]
+    },
+    'engine_no': {
+        'name': 'Engine no.',
+        'anchors': ['engine'],
+        'patterns': [
+            r'engine\s*(?:no|number)\.?\s*:?\s*([A-Z0-9]{4,})',
+            r'engine\s*:?\s*([A-Z0-9]{6,})',
+        ]
+    },
+    'chassis_no': {
+        'name': 'Chassis no.',
+        'anchors': ['chassis', 'vin'],
+        'patterns': [
+            r'chassis\s*(?:no|number)\.?\s*:?\s*([A-Z0-9]{4,})',
+            r'vin\s*:?\s*([A-Z0-9]{17})',
+        ]
+    },
+    'cheque_no': {
+        'name': 'Cheque no.',
+        'anchors': ['cheque', 'check'],
+        'patterns': [
+            r'cheque\s*(?:no|number)\.?\s*:?\s*([0-9]{4,})',
+            r'check\s*:?\s*([0-9]{6,})',
+        ]
+    },
+    'cheque_date': {
+        'name': 'Cheque date',
+        'anchors': ['date', 'paid'],
+        'patterns': [
+            rf'(?:cheque|payment)\s*date\s*:?\s*{DATE_PATTERN}',
+            rf'paid\s*on\s*:?\s*{DATE_PATTERN}',
+        ]
+    },
+    'bank_name': {
+        'name': 'Bank name',
+        'anchors': ['bank'],
+        'patterns': [
+            r'bank\s*(?:name)?\s*:?\s*([A-Za-z\s&\.\,\-]{3,})',
+            r'([A-Za-z\s&\.\-]{3,})\s*bank',
+        ]
+    },
+    'net_od_premium': {
+        'name': 'Net own damage premium amount',
+        'anchors': ['own', 'od'],
+        'patterns': [
+            rf'(?:own\s*damage|od)\s*premium\s*:?\s*{AMOUNT_PATTERN}',
+            rf'od\s*:?\s*{AMOUNT_PATTERN}',
+        ]
+    },
+    'net_liability_premium': {
+        'name': 'Net liability premium amount',
+        'anchors': ['liability', 'tp', 'third'],
+        'patterns': [
+            rf'(?:liability|tp|third\s*party)\s*premium\s*:?\s*{AMOUNT_PATTERN}',
+            rf'tp\s*:?\s*{AMOUNT_PATTERN}',
+        ]
+    },
+    'total_premium': {
+        'name': 'Total premium amount',
+        'anchors': ['total'],
+        'patterns': [
+            rf'total\s*premium\s*:?\s*{AMOUNT_PATTERN}',
+            rf'premium\s*total\s*:?\s*{AMOUNT_PATTERN}',
+        ]
+    },
+    'gst_amount': {
+        'name': 'GST amount',
+        'anchors': ['gst', 'tax'],
+        'patterns': [
+            rf'gst\s*:?\s*{AMOUNT_PATTERN}',
+            rf'tax\s*:?\s*{AMOUNT_PATTERN}',
+        ]
+    },
+    'gross_premium': {
+        'name': 'Gross premium paid',
+        'anchors': ['gross', 'total'],
+        'patterns': [
+            rf'gross\s*premium\s*:?\s*{AMOUNT_PATTERN}',
+            rf'total\s*amount\s*:?\s*{AMOUNT_PATTERN}',
+        ]
+    },
+    'car_model': {
+        'name': 'Car model',
+        'anchors': ['make', 'model', 'vehicle'],
+        'patterns': [
+            r'(?:make|model|vehicle)\s*:?\s*([A-Za-z0-9\s\-\/]{3,})',
+            r'make\s*[&\/]\s*model\s*:?\s*([A-Za-z0-9\s\-\/]{3,})',
+        ]
+    },
+    'body_type': {
+        'name': 'Body type',
+        'anchors': ['type'],
+        'patterns': [
+            r'body\s*type\s*:?\s*([A-Za-z\s\-]{3,})',
+            r'vehicle\s*type\s*:?\s*([A-Za-z\s\-]{3,})',
+        ]
+    }
+}
+
+
+def literal_prefix(pattern: str) -> str:
+    """Return the lowercase letters every match of pattern starts with, or '' if there are none"""
+    # A top-level alternative could match without the leading letters
+    depth = 0
+    in_class = escaped = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char in '()':
+            depth += 1 if char == '(' else -1
+        elif char == '|' and depth == 0:
+            return ''
+    
+    prefix = re.match(r'[a-z]*', pattern).group()
+    # The last letter is optional when a quantifier follows it
+    if pattern[len(prefix):len(prefix) + 1] in ('?', '*', '{'):
+        prefix = prefix[:-1]
+    return prefix
+
+
 class SimpleInsuranceExtractor:
     """Simple and reliable extractor for the 15 required insurance fields"""
     
-    def __init__(self):
+    def __init__(self, ocr_workers: Optional[int] = None, ocr_dpi: int = 200, fast_text: bool = False):
         self.logger = logging.getLogger(__name__)
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
         
-        # The 15 required fields with simple patterns
-        self.insurance_fields = {
-            'policy_no': {
-                'name': 'Policy no.',
-                'patterns': [
-                    r'(?:policy|certificate)\s*(?:no|number)\.?\s*:?\s*([A-Z0-9\-/]{4,})',
-                    r'policy\s*:?\s*([A-Z0-9\-/]{6,})',
-                ]
-            },
-            'insured_name': {
-                'name': 'Insured name',
-                'patterns': [
-                    r'insured\s*(?:name)?\s*:?\s*([A-Za-z\s\.\,]{3,50})',
-                    r'(?:mr|mrs|ms|dr|m/s)\.?\s+([A-Za-z\s\.\,]{3,50})',
-                ]
-            },
-            'insurer_name': {
-                'name': 'Insurer name',
-                'patterns': [
-                    r'(?:insurer|insurance\s*company)\s*:?\s*([A-Za-z\s&\.\,\-]{5,})',
-                    r'([A-Za-z\s&\.\-]{5,})\s*insurance',
-                ]
-            },
-            'engine_no': {
-                'name': 'Engine no.',
-                'patterns': [
-                    r'engine\s*(?:no|number)\.?\s*:?\s*([A-Z0-9]{4,})',
-                    r'engine\s*:?\s*([A-Z0-9]{6,})',
-                ]
-            },
-            'chassis_no': {
-                'name': 'Chassis no.',
-                'patterns': [
-                    r'chassis\s*(?:no|number)\.?\s*:?\s*([A-Z0-9]{4,})',
-                    r'vin\s*:?\s*([A-Z0-9]{17})',
-                ]
-            },
-            'cheque_no': {
-                'name': 'Cheque no.',
-                'patterns': [
-                    r'cheque\s*(?:no|number)\.?\s*:?\s*([0-9]{4,})',
-                    r'check\s*:?\s*([0-9]{6,})',
-                ]
-            },
-            'cheque_date': {
-                'name': 'Cheque date',
-                'patterns': [
-                    r'(?:cheque|payment)\s*date\s*:?\s*([0-9]{1,2}[\/\-\.][0-9]{1,2}[\/\-\.][0-9]{2,4})',
-                    r'paid\s*on\s*:?\s*([0-9]{1,2}[\/\-\.][0-9]{1,2}[\/\-\.][0-9]{2,4})',
-                ]
-            },
-            'bank_name': {
-                'name': 'Bank name',
-                'patterns': [
-                    r'bank\s*(?:name)?\s*:?\s*([A-Za-z\s&\.\,\-]{3,})',
-                    r'([A-Za-z\s&\.\-]{3,})\s*bank',
-                ]
-            },
-            'net_od_premium': {
-                'name': 'Net own damage premium amount',
-                'patterns': [
-                    r'(?:own\s*damage|od)\s*premium\s*:?\s*(?:rs\.?)?\s*([0-9,]+(?:\.[0-9]{2})?)',
-                    r'od\s*:?\s*(?:rs\.?)?\s*([0-9,]+(?:\.[0-9]{2})?)',
-                ]
-            },
-            'net_liability_premium': {
-                'name': 'Net liability premium amount',
-                'patterns': [
-                    r'(?:liability|tp|third\s*party)\s*premium\s*:?\s*(?:rs\.?)?\s*([0-9,]+(?:\.[0-9]{2})?)',
-                    r'tp\s*:?\s*(?:rs\.?)?\s*([0-9,]+(?:\.[0-9]{2})?)',
-                ]
-            },
-            'total_premium': {
-                'name': 'Total premium amount',
-                'patterns': [
-                    r'total\s*premium\s*:?\s*(?:rs\.?)?\s*([0-9,]+(?:\.[0-9]{2})?)',
-                    r'premium\s*total\s*:?\s*(?:rs\.?)?\s*([0-9,]+(?:\.[0-9]{2})?)',
-                ]
-            },
-            'gst_amount': {
-                'name': 'GST amount',
-                'patterns': [
-                    r'gst\s*:?\s*(?:rs\.?)?\s*([0-9,]+(?:\.[0-9]{2})?)',
-                    r'tax\s*:?\s*(?:rs\.?)?\s*([0-9,]+(?:\.[0-9]{2})?)',
-                ]
-            },
-            'gross_premium': {
-                'name': 'Gross premium paid',
-                'patterns': [
-                    r'gross\s*premium\s*:?\s*(?:rs\.?)?\s*([0-9,]+(?:\.[0-9]{2})?)',
-                    r'total\s*amount\s*:?\s*(?:rs\.?)?\s*([0-9,]+(?:\.[0-9]{2})?)',
-                ]
-            },
-            'car_model': {
-                'name': 'Car model',
-                'patterns': [
-                    r'(?:make|model|vehicle)\s*:?\s*([A-Za-z0-9\s\-\/]{3,})',
-                    r'make\s*[&\/]\s*model\s*:?\s*([A-Za-z0-9\s\-\/]{3,})',
-                ]
-            },
-            'body_type': {
-                'name': 'Body type',
-                'patterns': [
-                    r'body\s*type\s*:?\s*([A-Za-z\s\-]{3,})',
-                    r'vehicle\s*type\s*:?\s*([A-Za-z\s\-]{3,})',
-                ]
-            }
-        }
-    
-    def extract_from_pdf(self, pdf_path: str) -> Dict[str, str]:
-        """Extract the 15 required fields from a PDF"""
-        results = {}
+        # Pages OCR'd at once; each one is a separate tesseract process
+        self.ocr_workers = ocr_workers or os.cpu_count() or 1
+        # Typical policy fonts OCR as well at 200 dpi as at 300, with under half the pixels
+        self.ocr_dpi = ocr_dpi
+        # Read text layers with PDFium instead of pdfplumber
+        self.fast_text = fast_text
+        # Cleared if pdftocairo turns out to be missing, so pdfplumber renders from then on
+        self.use_poppler = convert_from_path is not None
+        self._tess_apis = queue.Queue()  # Idle tesserocr instances, kept loaded between pages and files
+        
+        # Re-runs over the same PDFs (e.g. after tweaking the patterns) skip OCR entirely
+        self.text_cache = None
+        if diskcache is not None:
+            try:
+                self.text_cache = diskcache.Cache(TEXT_CACHE_DIR)
+            except Exception as e:
+                self.logger.warning(f"Text cache unavailable, PDFs will be read again on every run: {e}")
+        
+        # Per-instance copy of the field table; the compiled patterns are added to it below
+        self.insurance_fields = {field_key: dict(field_info) for field_key, field_info in INSURANCE_FIELDS.items()}
         
+        # Compile every field's patterns once, instead of on each extract_field call
+        all_patterns = []
+        for field_info in self.insurance_fields.values():
+            field_info['compiled'] = [re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+                                      for pattern in field_info['patterns']]
+            field_info['pattern_ids'] = list(range(len(all_patterns), len(all_patterns) + len(field_info['patterns'])))
+            field_info['prefixes'] = [literal_prefix(pattern) for pattern in field_info['patterns']]
+            all_patterns.extend(field_info['patterns'])
+        
+        # With hyperscan, one pass over a page tells which of the patterns match at all
+        self.hs_db = None
+        if hyperscan is not None:
+            try:
+                self.hs_db = hyperscan.Database()
+                self.hs_db.compile(expressions=[pattern.encode('ascii') for pattern in all_patterns],
+                                   ids=list(range(len(all_patterns))), elements=len(all_patterns),
+                                   flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(all_patterns))
+            except Exception as e:
+                self.logger.warning(f"Hyperscan unavailable for the field patterns, using re: {e}")
+                self.hs_db = None
+    
+    def extract_from_pdf(self, pdf_path: str) -> Dict[str, Optional[str]]:
+        """Extract the 15 required fields from a PDF, mapping each field key to its value or None"""
         try:
-            # First try direct text extraction
-            text = self.extract_text_from_pdf(pdf_path)
-            
-            # If text is too short, try OCR
-            if len(text.strip()) < 100:
-                self.logger.info(f"Text extraction yielded little content, trying OCR for {pdf_path}")
-                text = self.extract_text_with_ocr(pdf_path)
+            # Search page by page, stopping once every field has been found
+            values = {}
+            pending = dict(self.insurance_fields)
+            try:
+                with pdfplumber.open(pdf_path) as pdf:
+                    for page_text in self.iter_page_texts(pdf, pdf_path):
+                        page_lower = page_text.lower()
+                        matched_ids = self.scan_page(page_text)
+                        for field_key in list(pending):
+                            value = self.extract_field(page_text, pending[field_key], page_lower, matched_ids)
+                            if value:
+                                values[field_key] = value
+                                del pending[field_key]
+                        
+                        if not pending:
+                            # The remaining pages aren't read or OCR'd at all
+                            break
+            except Exception as e:
+                self.logger.error(f"Error extracting text from {pdf_path}: {e}")
             
-            # Extract each field
+            # Report each field
             for field_key, field_info in self.insurance_fields.items():
-                value = self.extract_field(text, field_info)
-                results[field_key] = {
-                    'field_name': field_info['name'],
-                    'value': value if value else 'Not found',
-                    'found': bool(value)
-                }
-                
+                value = values.get(field_key)
                 status = "✅" if value else "❌"
                 self.logger.info(f"{status} {field_info['name']}: {value if value else 'Not found'}")
+            
+            return {field_key: values.get(field_key) for field_key in self.insurance_fields}
         
         except Exception as e:
             self.logger.error(f"Error processing {pdf_path}: {e}")
-            # Initialize empty results
-            for field_key, field_info in self.insurance_fields.items():
-                results[field_key] = {
-                    'field_name': field_info['name'],
-                    'value': 'Error',
-                    'found': False
-                }
+            return dict.fromkeys(self.insurance_fields, EXTRACTION_ERROR)
+    
+    def iter_page_texts(self, pdf, pdf_path: str) -> Iterator[str]:
+        """Yield each page's text in order, from the text cache when the PDF hasn't changed since it was read"""
+        document_key = self.document_key(pdf_path)
         
-        return results
+        pdfium_doc = self.open_pdfium(pdf_path)
+        try:
+            # Pages are taken a window at a time so the scanned ones can still be OCR'd together
+            window = max(self.ocr_workers, PAGE_WINDOW)
+            for start in range(0, len(pdf.pages), window):
+                pages = pdf.pages[start:start + window]
+                page_texts = [self.text_cache.get((document_key, page.page_number)) if document_key else None
+                              for page in pages]
+                
+                missing = [index for index, page_text in enumerate(page_texts) if page_text is None]
+                if missing:
+                    read_texts = self.read_page_texts([pages[index] for index in missing], pdf_path, pdfium_doc)
+                    for index, page_text in zip(missing, read_texts):
+                        page_texts[index] = page_text
+                        # Empty pages aren't kept, in case OCR failed rather than the page being blank
+                        if document_key and page_text.strip():
+                            self.text_cache.set((document_key, pages[index].page_number), page_text)
+                
+                yield from page_texts
+        finally:
+            if pdfium_doc is not None:
+                pdfium_doc.close()
     
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
-        """Extract text directly from PDF"""
-        text = ""
+    def document_key(self, pdf_path: str) -> Optional[tuple]:
+        """Identify this version of a PDF in the text cache, or None when there is no cache"""
+        if self.text_cache is None:
+            return None
+        
+        try:
+            stat = os.stat(pdf_path)
+        except OSError:
+            return None
+        # OCR'd text depends on the resolution the pages were rendered at and the tesseract
+        # settings, and text layers on which engine read them
+        return (os.path.abspath(pdf_path), stat.st_mtime_ns, stat.st_size, self.ocr_dpi, OCR_CONFIG,
+                self.fast_text)
+    
+    def open_pdfium(self, pdf_path: str):
+        """Open a PDF for reading text layers with PDFium, or return None to use pdfplumber"""
+        if not self.fast_text or pypdfium2 is None:
+            return None
+        
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            return pypdfium2.PdfDocument(pdf_path)
         except Exception as e:
-            self.logger.error(f"Error extracting text from {pdf_path}: {e}")
+            self.logger.warning(f"PDFium couldn't open {pdf_path}, using pdfplumber for its text: {e}")
+            return None
+    
+    def read_text_layer(self, page, pdfium_doc) -> str:
+        """Return a page's embedded text, without layout analysis"""
+        if pdfium_doc is None:
+            return page.extract_text() or ""
         
-        return text
+        pdfium_page = pdfium_doc[page.page_number - 1]
+        try:
+            text_page = pdfium_page.get_textpage()
+            try:
+                # PDFium ends lines with \r\n; the field patterns expect pdfplumber's \n
+                return text_page.get_text_range().replace('\r\n', '\n')
+            finally:
+                text_page.close()
+        finally:
+            pdfium_page.close()
     
-    def extract_text_with_ocr(self, pdf_path: str) -> str:
-        """Extract text using OCR"""
-        text = ""
+    def read_page_texts(self, pages: List, pdf_path: str, pdfium_doc) -> List[str]:
+        """Read pages' texts, using OCR only for pages without a usable text layer"""
+        page_texts = [self.read_text_layer(page, pdfium_doc) for page in pages]
+        scanned = [index for index, page_text in enumerate(page_texts)
+                   if len(page_text.strip()) < TEXT_LAYER_MIN_CHARS]
+        
+        if scanned:
+            self.logger.info(f"Text extraction yielded little content on {len(scanned)} of "
+                             f"{len(pages)} pages, trying OCR for {pdf_path}")
+            ocr_texts = self.extract_text_with_ocr([pages[index] for index in scanned], pdf_path)
+            for index, page_text in zip(scanned, ocr_texts):
+                if len(page_text.strip()) > len(page_texts[index].strip()):
+                    page_texts[index] = page_text
+        
+        return page_texts
+    
+    def extract_text_with_ocr(self, pages: List, pdf_path: str) -> List[str]:
+        """OCR pages of an open PDF, with one tesseract run per batch of pages, returning their texts in order"""
+        page_texts = [""] * len(pages)
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    # Convert page to image and OCR
-                    img = page.to_image(resolution=300)
-                    page_text = pytesseract.image_to_string(img.original)
-                    if page_text:
-                        text += page_text + "\n"
+            with tempfile.TemporaryDirectory(prefix='simple_ocr_') as temp_dir:
+                render_lock = threading.Lock()
+                with ThreadPoolExecutor(max_workers=self.ocr_workers) as executor:
+                    page_texts = self.ocr_pages(executor, pages, pdf_path, self.ocr_dpi, temp_dir, render_lock)
+                    
+                    # Pages that read poorly get a second pass at full resolution
+                    retry = [index for index, page_text in enumerate(page_texts)
+                             if len(page_text.strip()) < OCR_RETRY_MIN_CHARS]
+                    if retry and self.ocr_dpi < OCR_RETRY_DPI:
+                        retried = self.ocr_pages(executor, [pages[index] for index in retry], pdf_path,
+                                                 OCR_RETRY_DPI, temp_dir, render_lock)
+                        for index, page_text in zip(retry, retried):
+                            if len(page_text.strip()) > len(page_texts[index].strip()):
+                                page_texts[index] = page_text
         except Exception as e:
-            self.logger.error(f"Error with OCR for {pdf_path}: {e}")
+            self.logger.error(f"Error with OCR: {e}")
+        
+        return page_texts
+    
+    def ocr_pages(self, executor, pages: List, pdf_path: str, dpi: int, temp_dir: str,
+                  render_lock: threading.Lock) -> List[str]:
+        """OCR pages rendered at dpi on the executor, returning their texts in page order"""
+        # map keeps the page order
+        if tesserocr is not None:
+            return list(executor.map(lambda page: self.ocr_page_in_process(page, pdf_path, dpi, render_lock), pages))
+        
+        # Poppler renders pages side by side; with pdfplumber only the PNG encoding overlaps
+        image_paths = list(executor.map(lambda page: self.save_page_image(page, pdf_path, dpi, temp_dir, render_lock),
+                                        pages))
+        
+        # Spread the pages over the workers, each starting tesseract once per batch
+        batch_size = max(1, min(OCR_BATCH_PAGES, -(-len(image_paths) // self.ocr_workers)))
+        batches = [image_paths[i:i + batch_size] for i in range(0, len(image_paths), batch_size)]
+        return [page_text for batch_texts in executor.map(self.ocr_batch, batches) for page_text in batch_texts]
+    
+    def ocr_page_in_process(self, page, pdf_path: str, dpi: int, render_lock: threading.Lock) -> str:
+        """Render a page and OCR it on a pooled tesserocr instance, each used by one thread at a time"""
+        image = self.render_page(page, pdf_path, dpi, render_lock)
+        
+        try:
+            api = self._tess_apis.get_nowait()
+        except queue.Empty:
+            # The language model is loaded once per instance, not once per page
+            api = tesserocr.PyTessBaseAPI(lang='eng', psm=OCR_PAGE_SEG_MODE, oem=OCR_ENGINE_MODE)
+            for name, value in OCR_VARIABLES.items():
+                api.SetVariable(name, value)
+        
+        try:
+            api.SetImage(image)
+            page_text = api.GetUTF8Text()
+        except Exception:
+            api.End()
+            raise
         
-        return text
+        self._tess_apis.put(api)
+        return page_text
     
-    def extract_field(self, text: str, field_info: Dict) -> Optional[str]:
-        """Extract a single field using its patterns"""
-        text_lower = text.lower()
+    def render_page(self, page, pdf_path: str, dpi: int, render_lock: threading.Lock):
+        """Render a page at dpi, returning it as a PIL image"""
+        if self.use_poppler:
+            try:
+                return convert_from_path(pdf_path, dpi=dpi, first_page=page.page_number,
+                                         last_page=page.page_number)[0]
+            except Exception as e:
+                self.poppler_failed(e)
         
-        for pattern in field_info['patterns']:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE | re.MULTILINE)
-            if matches:
+        # pdfplumber renders through PDFium, which isn't thread-safe
+        with render_lock:
+            return page.to_image(resolution=dpi).original
+    
+    def save_page_image(self, page, pdf_path: str, dpi: int, temp_dir: str, render_lock: threading.Lock) -> str:
+        """Render a page and save it as a PNG for tesseract, returning its path"""
+        image_name = f"page_{page.page_number:05d}_{dpi}"
+        if self.use_poppler:
+            try:
+                # pdftocairo writes the PNG itself, without a round trip through PIL
+                return convert_from_path(pdf_path, dpi=dpi, first_page=page.page_number,
+                                         last_page=page.page_number, output_folder=temp_dir,
+                                         output_file=image_name, fmt='png', use_pdftocairo=True,
+                                         paths_only=True)[0]
+            except Exception as e:
+                self.poppler_failed(e)
+        
+        image_path = os.path.join(temp_dir, f"{image_name}.png")
+        # Light compression: the file is read back once, straight away
+        self.render_page(page, pdf_path, dpi, render_lock).save(image_path, 'PNG', compress_level=1)
+        return image_path
+    
+    def poppler_failed(self, error: Exception):
+        """Switch rendering back to pdfplumber after poppler fails"""
+        if self.use_poppler:
+            self.use_poppler = False
+            self.logger.warning(f"Poppler rendering failed, using pdfplumber instead: {error}")
+    
+    def ocr_batch(self, image_paths: List[str]) -> List[str]:
+        """OCR a list of page images with a single tesseract run, returning one text per page"""
+        list_path = os.path.splitext(image_paths[0])[0] + "_list.txt"
+        with open(list_path, 'w') as list_file:
+            list_file.write(''.join(f"{image_path}\n" for image_path in image_paths))
+        
+        # Tesseract ends every page's text with a form feed
+        texts = pytesseract.image_to_string(list_path, config=OCR_CONFIG).split('\f')
+        if len(texts) >= len(image_paths) and not ''.join(texts[len(image_paths):]).strip():
+            return texts[:len(image_paths)]
+        
+        self.logger.warning(f"Batch OCR returned {len(texts)} pages for {len(image_paths)} images, "
+                            f"retrying them one at a time")
+        return [pytesseract.image_to_string(image_path, config=OCR_CONFIG) for image_path in image_paths]
+    
+    def scan_page(self, text: str) -> Optional[Set[int]]:
+        """Return the ids of the field patterns that match somewhere in text, or None when hyperscan can't tell"""
+        # Hyperscan folds case for ASCII only, so other pages go straight to re
+        if self.hs_db is None or not text.isascii():
+            return None
+        
+        matched_ids = set()
+        self.hs_db.scan(text.encode('ascii').translate(HS_SEPARATORS_TO_SPACE),
+                        match_event_handler=lambda pattern_id, start, end, flags, context: matched_ids.add(pattern_id))
+        return matched_ids
+    
+    def extract_field(self, text: str, field_info: Dict, text_lower: Optional[str] = None,
+                      matched_ids: Optional[Set[int]] = None) -> Optional[str]:
+        """Extract a single field using its patterns, skipping those matched_ids rules out"""
+        # A substring check is much cheaper than a regex scan that can't match
+        if text_lower is None:
+            text_lower = text.lower()
+        if not any(anchor in text_lower for anchor in field_info['anchors']):
+            return None
+        
+        # Offsets in text_lower only line up with text when lowercasing kept every character
+        use_prefixes = text.isascii()
+        
+        # The patterns are case-insensitive, so the text is searched as is
+        for pattern_id, pattern, prefix in zip(field_info['pattern_ids'], field_info['compiled'],
+                                               field_info['prefixes']):
+            if matched_ids is not None and pattern_id not in matched_ids:
+                continue
+            
+            # Only the first match is used, so stop scanning there
+            if prefix and use_prefixes:
+                match = self.match_at_prefix(pattern, prefix, text, text_lower)
+            else:
+                match = pattern.search(text)
+            if match:
                 # Return the first match, cleaned
-                value = matches[0].strip()
+                value = match.group(1).strip()
                 return self.clean_value(value)
         
         return None
     
+    def match_at_prefix(self, pattern: re.Pattern, prefix: str, text: str, text_lower: str) -> Optional[re.Match]:
+        """Find pattern's first match by trying it only where its literal prefix occurs"""
+        index = text_lower.find(prefix)
+        while index >= 0:
+            match = pattern.match(text, index)
+            if match:
+                return match
+            index = text_lower.find(prefix, index + 1)
+        
+        return None
+    
     def clean_value(self, value: str) -> str:
         """Clean and format extracted values"""
         if not value:
@@ -222,37 +584,93 @@ class SimpleInsuranceExtractor:
         value = value.replace('\n', ' ').replace('\r', ' ')
         
         return value.strip()
+
+
+def create_excel(results_list: List[Dict], output_path: str) -> bool:
+    """Create Excel file with results, without needing an extractor instance"""
+    logger = logging.getLogger(__name__)
+    try:
+        # The columns come from the field table, so every row has the same layout
+        header = ['Filename']
+        for field_info in INSURANCE_FIELDS.values():
+            header += [field_info['name'], f"{field_info['name']} (Found)"]
     
-    def create_excel(self, results_list: List[Dict], output_path: str) -> bool:
-        """Create Excel file with results"""
+        # constant_memory streams each row to disk once it is written; extracted
+        # values stay plain text rather than becoming formulas or links
+        workbook = xlsxwriter.Workbook(output_path, {'constant_memory': True,
+                                                     'strings_to_formulas': False,
+                                                     'strings_to_urls': False})
         try:
-            excel_data = []
-            
-            for file_result in results_list:
-                filename = file_result['filename']
+            worksheet = workbook.add_worksheet()
+            worksheet.write_row(0, 0, header)
+            for row_num, file_result in enumerate(results_list, start=1):
                 data = file_result['data']
-                
-                row = {'Filename': filename}
-                
-                for field_key, field_info in data.items():
-                    row[field_info['field_name']] = field_info['value']
-                    row[f"{field_info['field_name']} (Found)"] = 'Yes' if field_info['found'] else 'No'
-                
-                excel_data.append(row)
-            
-            df = pd.DataFrame(excel_data)
-            df.to_excel(output_path, index=False)
-            
-            self.logger.info(f"Excel file created: {output_path}")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Error creating Excel file: {e}")
-            return False
+                row = [file_result['filename']]
+                for field_key in INSURANCE_FIELDS:
+                    value = data.get(field_key)
+                    found = value is not None and value != EXTRACTION_ERROR
+                    row += [value or 'Not found', 'Yes' if found else 'No']
+                worksheet.write_row(row_num, 0, row)
+        finally:
+            workbook.close()
+    
+        logger.info(f"Excel file created: {output_path}")
+        return True
+    
+    except Exception as e:
+        logger.error(f"Error creating Excel file: {e}")
+        return False
 
 
-def main():
-    """Simple command line interface"""
+# Each worker process builds its own extractor on first use
+_worker_extractor = None
+
+
+def process_pdf(pdf_path: str, ocr_workers: Optional[int] = None) -> Dict:
+    """Extract one PDF in a worker process, returning its result entry"""
+    global _worker_extractor
+    if _worker_extractor is None:
+        _worker_extractor = SimpleInsuranceExtractor(ocr_workers)
+    
+    return {
+        'filename': os.path.basename(pdf_path),
+        'data': _worker_extractor.extract_from_pdf(pdf_path)
+    }
+
+
+def extract_files(file_paths: List[str], mp_context=None) -> List[Dict]:
+    """Extract every PDF in parallel, one file per worker, returning results in the given order"""
+    results = [None] * len(file_paths)
+    print(f"\nProcessing {len(file_paths)} files...")
+    
+    cpu_count = os.cpu_count() or 1
+    workers = min(len(file_paths), cpu_count)
+    # Share the cores between files and their pages, so tesseract isn't oversubscribed
+    ocr_workers = max(1, cpu_count // workers)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+        futures = {executor.submit(process_pdf, pdf_path, ocr_workers): index
+                   for index, pdf_path in enumerate(file_paths)}
+        for done, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            results[index] = future.result()
+            print(f"\n[{done}/{len(file_paths)}] Processed: {results[index]['filename']}")
+    
+    return results
+
+
+def run_batch(file_paths: List[str], output_path: str) -> bool:
+    """Extract the given PDFs and save the results to output_path, without any GUI"""
+    results = extract_files(file_paths)
+    success = create_excel(results, output_path)
+    if success:
+        print(f"\n✅ Results saved to: {output_path}")
+    else:
+        print("❌ Error saving results")
+    return success
+
+
+def _gui_select():
+    """Extract PDFs chosen in file dialogs and save the results where the user picks"""
     import tkinter as tk
     from tkinter import filedialog, messagebox
     
@@ -273,22 +691,8 @@ def main():
         print("No files selected. Exiting.")
         return
     
-    # Initialize extractor
-    extractor = SimpleInsuranceExtractor()
-    
-    # Process files
-    results = []
-    print(f"\nProcessing {len(file_paths)} files...")
-    
-    for i, pdf_path in enumerate(file_paths, 1):
-        filename = os.path.basename(pdf_path)
-        print(f"\n[{i}/{len(file_paths)}] Processing: {filename}")
-        
-        data = extractor.extract_from_pdf(pdf_path)
-        results.append({
-            'filename': filename,
-            'data': data
-        })
+    # Spawned rather than forked, since Tk is already running in this process
+    results = extract_files(list(file_paths), multiprocessing.get_context('spawn'))
     
     # Ask for output location
     output_path = filedialog.asksaveasfilename(
@@ -298,7 +702,7 @@ def main():
     )
     
     if output_path:
-        success = extractor.create_excel(results, output_path)
+        success = create_excel(results, output_path)
         if success:
             print(f"\n✅ Results saved to: {output_path}")
             messagebox.showinfo("Success", f"Results saved to:\n{output_path}")
@@ -308,5 +712,22 @@ def main():
     
     print("\nProcessing complete!")
 
+
+def main():
+    """Command line interface: PDFs and an output .xlsx as arguments, or file dialogs without them"""
+    # Needed for the worker processes in a frozen build
+    multiprocessing.freeze_support()
+    
+    if len(sys.argv) == 1:
+        _gui_select()
+        return
+    
+    if len(sys.argv) < 3:
+        print(f"Usage: {os.path.basename(sys.argv[0])} PDF [PDF ...] OUTPUT.xlsx")
+        sys.exit(2)
+    
+    if not run_batch(sys.argv[1:-1], sys.argv[-1]):
+        sys.exit(1)
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
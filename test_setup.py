@@ -28,6 +28,7 @@ def test_dependencies():
         'tkinter': 'GUI framework (built-in)',
         'pdfplumber': 'PDF text extraction',
         'openpyxl': 'Excel file creation',
+        'xlsxwriter': 'Streaming Excel export',
         'pandas': 'Data manipulation',
         're': 'Regular expressions (built-in)',
         'threading': 'Multi-threading (built-in)',
@@ -138,6 +139,219 @@ def test_main_application():
         print(f"❌ Main application test failed: {e}")
         return False
 
+def test_ocr_postprocessing():
+    """Test that OCR clean-up fixes IDs without touching tables and dates"""
+    print("\n🔍 Testing OCR post-processing...")
+    
+    try:
+        from pdf_extractor import postprocess_ocr_text
+        
+        # Amounts, table columns and dates are separated by spaces on purpose
+        table = 'OD TP GST Total\n1000 180 324 1504\nPolicy Period\n01 04 2024 to 31 03 2025'
+        if postprocess_ocr_text(table) != table:
+            print(f"❌ Tables and dates were changed: {postprocess_ocr_text(table)!r}")
+            return False
+        
+        # IDs after a label get O misreads and split digit runs fixed
+        fixed = postprocess_ocr_text('Policy No: 2O24 1005 Period 01 04 2024')
+        if fixed != 'Policy No: 20241005 Period 01 04 2024':
+            print(f"❌ Policy number not fixed: {fixed!r}")
+            return False
+        
+        # Words after an ID are not glued onto it, even when they contain digits
+        for text in ('Policy no 12345 1 year', 'Policy No 12345 2nd copy', 'policy no 12345 3yrs'):
+            if postprocess_ocr_text(text) != text:
+                print(f"❌ Text after a policy number was changed: {postprocess_ocr_text(text)!r}")
+                return False
+        
+        print("✅ OCR post-processing working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ OCR post-processing test failed: {e}")
+        return False
+
+def test_combined_search_matcher():
+    """Test that the combined search matcher finds what searching each term separately finds"""
+    print("\n🔍 Testing combined search matcher...")
+    
+    try:
+        import re
+        import logging
+        from pdf_extractor import PDFDataExtractor
+        
+        # The matching methods don't use the GUI, so it isn't built
+        extractor = PDFDataExtractor.__new__(PDFDataExtractor)
+        extractor.logger = logging.getLogger('test_setup')
+        
+        # Overlapping terms, listed in an order the alternation doesn't prefer
+        terms = ['GST Amount', 'GST', 'Amount', 'gst']
+        pages = [(1, 'GST Amount: 180\nTotal GST 324'), (2, 'GSTIN 27AB GST Amount GSTGST amount')]
+        
+        for whole_words in (False, True):
+            for case_sensitive in (False, True):
+                options = {'case_sensitive': case_sensitive, 'regex': False, 'whole_words': whole_words,
+                           'include_context': False, 'context_length': 0}
+                matcher = extractor.compile_search_terms(terms, options)
+                
+                # What searching each term on its own finds, grouped by term in listed order
+                flags = 0 if case_sensitive else re.IGNORECASE
+                expected = []
+                for term in terms:
+                    pattern = re.escape(term)
+                    if whole_words:
+                        pattern = r'\b' + pattern + r'\b'
+                    for page_num, page_text in pages:
+                        for match in re.finditer(pattern, page_text, flags):
+                            expected.append((term, page_num, match.group(), '', match.start()))
+                
+                # The re alternation, and hyperscan when it is installed
+                for hs_db in [None] + ([matcher['hs_db']] if matcher['hs_db'] is not None else []):
+                    extractor.search_matcher = dict(matcher, hs_db=hs_db)
+                    found = extractor.find_matches(pages, options)
+                    if found != expected:
+                        engine = 're' if hs_db is None else 'hyperscan'
+                        print(f"❌ Combined matches differ ({engine}, whole_words={whole_words}, "
+                              f"case_sensitive={case_sensitive}): {found} != {expected}")
+                        return False
+        
+        print("✅ Combined search matcher working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Combined search matcher test failed: {e}")
+        return False
+
+def test_text_cache():
+    """Test that the text cache round-trips pages and misses once the file changes"""
+    print("\n🔍 Testing text cache...")
+    
+    try:
+        import pdf_extractor
+        from pdf_extractor import TextCache
+        
+        options = {'force_ocr': False, 'auto_ocr': True, 'fast_text': False}
+        pages = [(1, 'Policy No: AB1234'), (2, 'Total Premium: Rs. 3,328.00 ✓')]
+        
+        # zstandard when it is installed, and the zlib fallback in any case
+        codecs = [pdf_extractor.zstandard] if pdf_extractor.zstandard is not None else []
+        codecs.append(None)
+        original_zstandard = pdf_extractor.zstandard
+        try:
+            for codec in codecs:
+                pdf_extractor.zstandard = codec
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    cache = TextCache(cache_dir=os.path.join(temp_dir, 'cache'))
+                    file_path = os.path.join(temp_dir, 'policy.pdf')
+                    with open(file_path, 'wb') as pdf_file:
+                        pdf_file.write(b'%PDF-1.4 first version')
+                    
+                    key = cache.key_for(file_path, options)
+                    if cache.get(key) is not None or cache.contains(key):
+                        print("❌ Empty text cache returned an entry")
+                        return False
+                    cache.put(key, pages, 'Normal')
+                    if cache.get(key) != (pages, 'Normal') or not cache.contains(key):
+                        print(f"❌ Text cache round trip failed: {cache.get(key)!r}")
+                        return False
+                    
+                    # Changing the file's contents gives a new key, so the old pages aren't served
+                    with open(file_path, 'wb') as pdf_file:
+                        pdf_file.write(b'%PDF-1.4 second version')
+                    new_key = cache.key_for(file_path, options)
+                    if new_key == key or cache.get(new_key) is not None:
+                        print("❌ Text cache served a stale entry for a modified file")
+                        return False
+                    
+                    # Re-extracting stores the new pages alongside the old entry
+                    new_pages = [(1, 'Policy No: CD5678')]
+                    cache.put(new_key, new_pages, 'OCR')
+                    if cache.get(new_key) != (new_pages, 'OCR') or cache.get(key) != (pages, 'Normal'):
+                        print("❌ Text cache returned the wrong entry after re-extraction")
+                        return False
+        finally:
+            pdf_extractor.zstandard = original_zstandard
+        
+        print("✅ Text cache working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Text cache test failed: {e}")
+        return False
+
+def insurance_sample_texts():
+    """Return policy text samples covering every field of the simple insurance extractor"""
+    samples = [
+        'Policy No.: AB/1234-56', 'CERTIFICATE NUMBER 99887766', 'Policy : XYZ12345', 'policy number: ab1234',
+        'Insured Name: John Smith', 'MR. RAJESH KUMAR', 'M/S Acme Traders', 'Dr Asha Rao',
+        'Insurer: National Insurance Co. Ltd', 'ICICI Lombard General Insurance', 'INSURANCE COMPANY : Tata AIG',
+        'Engine No. K12MN1234567', 'ENGINE NUMBER: 4D56ABC', 'Engine: ABC123456',
+        'Chassis No: MA3EWB22S00123456', 'VIN: 1HGCM82633A004352',
+        'Cheque No. 123456', 'CHEQUE NUMBER: 004512', 'Check: 987654',
+        'Cheque Date: 01/04/2024', 'Payment Date 1-4-24', 'Paid on: 15.03.2024',
+        'Bank Name: HDFC Bank Ltd', 'STATE BANK OF INDIA', 'Drawn on Axis Bank',
+        'Own Damage Premium: Rs. 1,234.00', 'OD Premium 5,000', 'OD: 780.50',
+        'Liability Premium: Rs 2,094.00', 'TP Premium: 1,500', 'Third Party Premium 750', 'TP: 300',
+        'Total Premium: Rs. 3,328.00', 'Premium Total : 4,000',
+        'GST: Rs. 599.04', 'GST 18.00', 'Tax: 120.00',
+        'Gross Premium: 3,927.04', 'Total Amount Rs. 5,000.00',
+        'Make / Model: Maruti Swift VXI', 'Vehicle: Honda City', 'MODEL: i20 Asta',
+        'Body Type: Saloon', 'Vehicle Type - Hatchback',
+    ]
+    # Each sample on its own, a whole page of them, and the page in other cases
+    page = '\n'.join(samples)
+    return samples + [page, page.upper(), page.lower()]
+
+def test_prefix_fast_path():
+    """Test that field patterns give the same values with and without the literal prefix fast path"""
+    print("\n🔍 Testing field prefix fast path...")
+    
+    try:
+        from simple_insurance_extractor import SimpleInsuranceExtractor
+        
+        extractor = SimpleInsuranceExtractor()
+        for text in insurance_sample_texts():
+            for field_key, field_info in extractor.insurance_fields.items():
+                # Without prefixes every pattern falls back to a full re search
+                searched = dict(field_info, prefixes=[''] * len(field_info['patterns']))
+                fast = extractor.extract_field(text, field_info)
+                expected = extractor.extract_field(text, searched)
+                if fast != expected:
+                    print(f"❌ {field_key} differs with the prefix fast path: {fast!r} != {expected!r} in {text!r}")
+                    return False
+        
+        print("✅ Field prefix fast path working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Field prefix fast path test failed: {e}")
+        return False
+
+def test_field_anchors():
+    """Test that every field's anchor words cover what its patterns can match"""
+    print("\n🔍 Testing field anchors...")
+    
+    try:
+        from simple_insurance_extractor import SimpleInsuranceExtractor
+        
+        extractor = SimpleInsuranceExtractor()
+        for text in insurance_sample_texts():
+            for field_key, field_info in extractor.insurance_fields.items():
+                # An empty anchor is in every text, so the patterns always run
+                unanchored = dict(field_info, anchors=[''])
+                anchored_value = extractor.extract_field(text, field_info)
+                expected = extractor.extract_field(text, unanchored)
+                if anchored_value != expected:
+                    print(f"❌ {field_key} anchors skip a match: {anchored_value!r} != {expected!r} in {text!r}")
+                    return False
+        
+        print("✅ Field anchors working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Field anchors test failed: {e}")
+        return False
+
 def run_all_tests():
     """Run all tests and provide summary"""
     print("=" * 50)
@@ -149,7 +363,12 @@ def run_all_tests():
         ("Dependencies", test_dependencies),
         ("PDF Processing", test_pdf_processing),
         ("Excel Export", test_excel_export),
-        ("Main Application", test_main_application)
+        ("Main Application", test_main_application),
+        ("OCR Post-processing", test_ocr_postprocessing),
+        ("Combined Search Matcher", test_combined_search_matcher),
+        ("Text Cache", test_text_cache),
+        ("Field Prefix Fast Path", test_prefix_fast_path),
+        ("Field Anchors", test_field_anchors)
     ]
     
     results = {}